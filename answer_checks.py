@@ -0,0 +1,163 @@
+import json
+import logging
+import re
+
+from prompt_builder import truncate_to_tokens
+
+# Batched plagiarism and AI-content checks for test answers.
+#
+# All of a candidate's answers go out in one completion request that asks for
+# both verdicts per answer as a JSON array, instead of two yes/no requests per
+# answer. The reply is parsed into AnswerVerdict records; anything missing or
+# malformed becomes an unknown verdict (None) rather than a retry, so bad
+# output never costs extra calls.
+#
+# An optional local AI-text prefilter (e.g. stylometry.score) settles the AI
+# verdict for answers it is confident about; when only the AI verdict is
+# requested, just the ambiguous answers are sent, and often no call is made.
+
+logger = logging.getLogger(__name__)
+
+# Long answers are cut to this many tokens in the prompt
+MAX_ANSWER_TOKENS = 400
+# Completion tokens per answer for one {"answer": n, "plagiarized": ..., "ai_generated": ...} object
+TOKENS_PER_VERDICT = 24
+
+VERDICT_FIELDS = ('plagiarized', 'ai_generated')
+FIELD_QUESTIONS = {
+    'plagiarized': 'whether it is plagiarized (copied from a published source)',
+    'ai_generated': 'whether it was generated by AI',
+}
+
+PROMPT_TEMPLATE = """Review the numbered test answers below. For each answer decide {questions}.
+Respond with only a JSON array containing one object per answer, in order, like
+[{example}]
+
+{answers}
+
+JSON:"""
+
+TRUE_WORDS = ('true', 'yes', 'y', '1')
+FALSE_WORDS = ('false', 'no', 'n', '0')
+JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+class AnswerVerdict:
+    # plagiarized / ai_generated are True, False or None when the model gave no usable answer;
+    # ai_confidence is the local prefilter's score, if one ran
+    def __init__(self, answer, plagiarized=None, ai_generated=None, ai_confidence=None):
+        self.answer = answer
+        self.plagiarized = plagiarized
+        self.ai_generated = ai_generated
+        self.ai_confidence = ai_confidence
+
+    def to_dict(self):
+        return {'answer': self.answer, 'plagiarized': self.plagiarized, 'ai_generated': self.ai_generated,
+                'ai_confidence': self.ai_confidence}
+
+    def __repr__(self):
+        return f"AnswerVerdict(plagiarized={self.plagiarized!r}, ai_generated={self.ai_generated!r})"
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    if isinstance(value, str):
+        word = value.strip().lower()
+        if word in TRUE_WORDS:
+            return True
+        if word in FALSE_WORDS:
+            return False
+    return None
+
+
+def build_check_prompt(answers, fields=VERDICT_FIELDS):
+    numbered = "\n\n".join(f"Answer {i + 1}:\n{truncate_to_tokens((answer or '').strip(), MAX_ANSWER_TOKENS)}"
+                           for i, answer in enumerate(answers))
+    example = json.dumps(dict([('answer', 1)] + [(field, False) for field in fields]))
+    questions = ' and '.join(FIELD_QUESTIONS[field] for field in fields)
+    return PROMPT_TEMPLATE.format(questions=questions, example=example, answers=numbered)
+
+
+# Parses the model's reply into one AnswerVerdict per answer; fields the reply
+# leaves out stay None
+def parse_verdicts(text, answers, fields=VERDICT_FIELDS):
+    verdicts = [AnswerVerdict(answer) for answer in answers]
+    match = JSON_ARRAY_RE.search(text or '')
+    if not match:
+        return verdicts
+    try:
+        items = json.loads(match.group(0))
+    except ValueError:
+        return verdicts
+    if not isinstance(items, list):
+        return verdicts
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        # Trust the answer number if the model gave a valid one, else the position
+        number = item.get('answer')
+        index = number - 1 if isinstance(number, int) and 1 <= number <= len(answers) else position
+        if index >= len(answers):
+            continue
+        for field in fields:
+            setattr(verdicts[index], field, _as_bool(item.get(field)))
+    return verdicts
+
+
+class AnswerChecker:
+    # `complete(prompt, max_tokens)` returns the completion text. `fields` are
+    # the verdicts to produce; fields not listed are left None. `ai_prefilter`
+    # maps a list of answers to AI confidences in [0, 1], and scores outside
+    # `ambiguous` settle the AI verdict locally.
+    def __init__(self, complete, fields=VERDICT_FIELDS, ai_prefilter=None, ambiguous=(0.25, 0.75)):
+        self.complete = complete
+        self.fields = tuple(fields)
+        self.ai_prefilter = ai_prefilter
+        self.ambiguous = ambiguous
+
+    # At most one request for all of a candidate's answers; returns a list of AnswerVerdict
+    def check(self, answers):
+        answers = list(answers)
+        verdicts = [AnswerVerdict(answer) for answer in answers]
+        # Blank answers can't be judged, so they aren't sent
+        filled = [i for i, answer in enumerate(answers) if answer and answer.strip()]
+        for i in set(range(len(answers))) - set(filled):
+            for field in self.fields:
+                setattr(verdicts[i], field, False)
+        if not filled:
+            return verdicts
+
+        if self.ai_prefilter is not None and 'ai_generated' in self.fields:
+            low, high = self.ambiguous
+            for i, confidence in zip(filled, self.ai_prefilter([answers[i] for i in filled])):
+                verdicts[i].ai_confidence = float(confidence)
+                if confidence >= high:
+                    verdicts[i].ai_generated = True
+                elif confidence <= low:
+                    verdicts[i].ai_generated = False
+
+        asked = [i for i in filled if any(getattr(verdicts[i], field) is None for field in self.fields)]
+        if not asked:
+            return verdicts
+        subset = [answers[i] for i in asked]
+        fields = [field for field in self.fields if any(getattr(verdicts[i], field) is None for i in asked)]
+        try:
+            reply = self.complete(build_check_prompt(subset, fields),
+                                  max_tokens=TOKENS_PER_VERDICT * len(subset) + 16)
+        except Exception as e:
+            logger.warning("Error checking answers: %s", e)
+            reply = ''
+        for i, parsed in zip(asked, parse_verdicts(reply, subset, fields)):
+            # Verdicts already settled locally are kept
+            for field in fields:
+                if getattr(verdicts[i], field) is None:
+                    setattr(verdicts[i], field, getattr(parsed, field))
+        return verdicts
+
+
+# Display text for a verdict field
+def label(value):
+    return 'Unknown' if value is None else str(value)
@@ -1,148 +1,465 @@
+import logging
 import os
+import threading
+import time
 import uuid
-from flask import Flask, request, render_template, redirect, url_for
-from werkzeug.utils import secure_filename
+from flask import Flask, request, render_template, redirect, url_for, jsonify, Response
 from azure.ai.openai import OpenAIClient
 from azure.core.credentials import AzureKeyCredential
-import docx2txt
-import PyPDF2
-import textract
+from answer_checks import AnswerChecker
+from candidate_store import SORT_COLUMNS, CandidateStore, parse_match_percentage
+from extraction_cache import ExtractionCache
+from extraction_pool import ExtractionPool
+from ingest import UploadIngestor
+from llm_cache import cache_from_env
+from llm_dispatch import LLMDispatcher
+from llm_metrics import PROMETHEUS_CONTENT_TYPE, LLMMetrics
+from pipeline import Pipeline, Stage
+from plagiarism_index import MinHashLSH
+import prerank
+from prompt_builder import build_prompt, count_tokens
+from resume_parser import PARSER_SETTINGS
+from screening_jobs import DONE, FAILED, JobManager, JobStore
+import stylometry
+from tracing import span, tracer_from_env
 
 app = Flask(__name__)
+logger = logging.getLogger(__name__)
 
 # Azure OpenAI credentials (replace with your actual keys)
 api_key = os.getenv("AZURE_OPENAI_API_KEY")
 endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-client = OpenAIClient(endpoint=endpoint, credential=AzureKeyCredential(api_key))
 
 UPLOAD_FOLDER = 'uploads'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+# Extracted resume text is cached by content hash, bounded to EXTRACTION_CACHE_MAX_MB on disk
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", os.path.join('cache', 'extracted'))
+EXTRACTION_CACHE_MAX_MB = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "256"))
 
-# Data structure to hold candidate information and test links
-candidates = {}
+# Bulk uploads are parsed in a process pool; EXTRACTION_TIMEOUT is per file, in seconds
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "60"))
 
-# Function to extract text from different resume formats
-def extract_text(file_path):
-    try:
-        if file_path.endswith('.docx'):
-            return docx2txt.process(file_path)
-        elif file_path.endswith('.pdf'):
-            text = ''
-            with open(file_path, 'rb') as pdf_file:
-                reader = PyPDF2.PdfFileReader(pdf_file)
-                for page in range(reader.numPages):
-                    text += reader.getPage(page).extract_text()
+# At most LLM_MAX_CONCURRENCY completion calls in flight, within the deployment's per-minute quota (0 = unlimited)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+
+# Prompt budget in tokens, excluding the completion; text-davinci-002 has a 4097-token context
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+
+# Local pre-ranking: only the top PRERANK_SHORTLIST_RATIO of a batch (at least PRERANK_MIN_SHORTLIST
+# resumes, plus any scoring PRERANK_MIN_SCORE or more) is sent to the LLM; a ratio of 1 disables it
+PRERANK_SHORTLIST_RATIO = float(os.getenv("PRERANK_SHORTLIST_RATIO", "0.25"))
+PRERANK_MIN_SHORTLIST = int(os.getenv("PRERANK_MIN_SHORTLIST", "20"))
+PRERANK_MIN_SCORE = float(os.getenv("PRERANK_MIN_SCORE", "0")) or None
+
+# Bounded queue size between screening stages
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "32"))
+
+# Candidate information and test links, shared by every worker process through SQLite
+CANDIDATE_DB_PATH = os.getenv("CANDIDATE_DB_PATH", 'candidates.sqlite3')
+
+# Uploads are screened in the background; SCREENING_WORKERS batches run at once. Job status is
+# kept in its own SQLite file so any worker process can answer a poll; sharing the candidate
+# database would invalidate its read cache on every progress write.
+SCREENING_WORKERS = int(os.getenv("SCREENING_WORKERS", "2"))
+SCREENING_JOB_DB_PATH = os.getenv("SCREENING_JOB_DB_PATH", 'screening_jobs.sqlite3')
+
+# Dashboard rows per page (the API caps per_page at DASHBOARD_MAX_PAGE_SIZE)
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "50"))
+DASHBOARD_MAX_PAGE_SIZE = int(os.getenv("DASHBOARD_MAX_PAGE_SIZE", "500"))
+
+# Submitted answers are indexed with MinHash/LSH so each new answer is compared against every
+# other candidate's; matches at or above PLAGIARISM_THRESHOLD (estimated Jaccard) are flagged
+PLAGIARISM_THRESHOLD = float(os.getenv("PLAGIARISM_THRESHOLD", "0.5"))
+# Answers submitted before this process started are indexed by a background thread that the
+# first sync starts; requests only index what was submitted since. A check waits up to
+# PLAGIARISM_LOAD_WAIT seconds for that load and is reported as incomplete if it's still running.
+PLAGIARISM_LOAD_WAIT = float(os.getenv("PLAGIARISM_LOAD_WAIT", "60"))
+
+# AI-generated answers are scored locally; only scores between AI_CHECK_LOW and AI_CHECK_HIGH are
+# sent to the LLM (in one request per candidate)
+AI_CHECK_LOW = float(os.getenv("AI_CHECK_LOW", "0.25"))
+AI_CHECK_HIGH = float(os.getenv("AI_CHECK_HIGH", "0.75"))
+
+# Completion through the response cache; misses go through the dispatcher's rate limits and retries.
+# Every call is recorded in llm_metrics under `stage`.
+def complete(prompt, max_tokens, model="text-davinci-002", stage='other'):
+    with span('llm', stage=stage, model=model), llm_metrics.observe(stage, model) as record:
+        def call():
+            record.miss()
+            response = client.completions.create(
+                model=model,
+                prompt=prompt,
+                max_tokens=max_tokens
+            )
+            text = response.choices[0].text.strip()
+            usage = getattr(response, 'usage', None)
+            record.usage(getattr(usage, 'prompt_tokens', None) or count_tokens(prompt),
+                         getattr(usage, 'completion_tokens', None) or count_tokens(text))
             return text
-        else:
-            return textract.process(file_path).decode('utf-8')
-    except Exception as e:
-        print(f"Error processing file {file_path}: {e}")
-        return ""
+        tokens = count_tokens(prompt) + max_tokens
+        return llm_cache.cached(model, prompt, lambda: llm_dispatcher.call(call, tokens, on_retry=record.retry),
+                                max_tokens=max_tokens)
 
 # Function to match resume with job description using Azure OpenAI
 def match_resume_with_job_description(job_description, resume_text):
-    prompt = f"""
+    prompt = build_prompt("""
     Match the following resume with the job description considering skills and work experience, and provide a match percentage:
     
     Job Description:
     {job_description}
     
     Resume:
-    {resume_text}
+    {resume}
     
     Please provide a detailed analysis and a match percentage.
-    """
-    response = client.completions.create(
-        model="text-davinci-002",
-        prompt=prompt,
-        max_tokens=100
-    )
-    return response.choices[0].text.strip()
+    """, job_description, resume_text, PROMPT_TOKEN_BUDGET, label='match')
+    return complete(prompt, max_tokens=100, stage='match')
 
 # Function to generate test questions for a candidate
 def generate_test_questions(candidate_name, job_description, resume_text):
-    prompt = f"""
+    prompt = build_prompt("""
     Based on the following resume and job description, create 10 subjective questions to assess the candidate's skills and work experience.
     
     Job Description:
     {job_description}
     
     Resume:
-    {resume_text}
+    {resume}
     
     Provide 10 questions:
-    """
-    response = client.completions.create(
-        model="text-davinci-002",
-        prompt=prompt,
-        max_tokens=500
-    )
-    questions = response.choices[0].text.strip().split('\n')
+    """, job_description, resume_text, PROMPT_TOKEN_BUDGET - 500, label='questions')
+    questions = complete(prompt, max_tokens=500, stage='questions').split('\n')
     return questions
 
+# Builds the clients, stores and pools the routes use. Called on import, except in extraction
+# workers: they re-run the launching script as __mp_main__ (`python app.py`) but only need
+# resume_parser, so they shouldn't open the databases, walk the cache or start pools of their own.
+def init_services():
+    global tracer, client, upload_ingestor, extraction_cache, extraction_pool, llm_dispatcher, llm_cache
+    global llm_metrics, candidate_store, screening_jobs, plagiarism_index, plagiarism_sync, plagiarism_lock
+    global answer_checker
+
+    # Requests are traced stage by stage when sampled; see tracing.tracer_from_env for settings
+    tracer = tracer_from_env()
+    tracer.init_app(app)
+
+    client = OpenAIClient(endpoint=endpoint, credential=AzureKeyCredential(api_key))
+
+    if not os.path.exists(UPLOAD_FOLDER):
+        os.makedirs(UPLOAD_FOLDER)
+
+    # Uploads are stored by content hash with a manifest per batch
+    upload_ingestor = UploadIngestor(UPLOAD_FOLDER)
+
+    extraction_cache = ExtractionCache(EXTRACTION_CACHE_DIR, max_bytes=EXTRACTION_CACHE_MAX_MB * 1024 * 1024,
+                                       salt=PARSER_SETTINGS)
+    extraction_pool = ExtractionPool(workers=EXTRACTION_WORKERS, timeout=EXTRACTION_TIMEOUT,
+                                     cache=extraction_cache)
+
+    llm_dispatcher = LLMDispatcher(max_concurrency=LLM_MAX_CONCURRENCY,
+                                   requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+                                   tokens_per_minute=LLM_TOKENS_PER_MINUTE)
+
+    # Completions are cached on disk by model and prompt; see llm_cache.cache_from_env for settings
+    llm_cache = cache_from_env()
+
+    # Latency, token and retry histograms per stage and model, served on /metrics
+    llm_metrics = LLMMetrics()
+
+    candidate_store = CandidateStore(CANDIDATE_DB_PATH)
+    screening_jobs = JobManager(workers=SCREENING_WORKERS, store=JobStore(SCREENING_JOB_DB_PATH))
+
+    plagiarism_index = MinHashLSH()
+    plagiarism_sync = {'since': time.time(), 'loader': None}
+    plagiarism_lock = threading.Lock()
+
+    # Checks only the AI verdict; plagiarism is handled by the local index
+    answer_checker = AnswerChecker(lambda prompt, max_tokens: complete(prompt, max_tokens, stage='ai_check'),
+                                   fields=('ai_generated',), ai_prefilter=stylometry.score,
+                                   ambiguous=(AI_CHECK_LOW, AI_CHECK_HIGH))
+
+if __name__ != '__mp_main__':
+    init_services()
+
 # Function to generate test link
 def generate_test_link(candidate_name):
     unique_id = uuid.uuid4().hex
     return f"/test/{unique_id}"
 
+# Runs one screening batch on a job worker, traced under the job id
+def screen_resumes(job, job_description, manifest):
+    with tracer.trace('screen_resumes', trace_id=job.id, resumes=len(manifest['entries'])):
+        run_screening(job, job_description, manifest)
+
+# Screens one batch as a stage pipeline:
+# extract -> match -> threshold -> generate questions -> create test link.
+# Each resume moves to the next stage as soon as it is ready, and progress is
+# recorded on the job. Only the first copy of each distinct file is screened;
+# duplicates mirror its result at the end.
+def run_screening(job, job_description, manifest):
+    entries = manifest['entries']
+    unique = [i for i, entry in enumerate(entries) if entry['duplicate_of'] is None]
+    file_paths = [entries[i]['path'] for i in unique]
+    digests = [entries[i]['sha256'] for i in unique]
+    # Pre-ranking needs the whole batch; without it, matching starts as soon as each extraction finishes
+    use_prerank = PRERANK_SHORTLIST_RATIO < 1 and len(unique) > PRERANK_MIN_SHORTLIST
+
+    def extracted():
+        texts = {}
+        with span('extract', files=len(file_paths)):
+            for k, file_path, resume_text in extraction_pool.extract(file_paths, digests):
+                i = unique[k]
+                job.update(i, status='extracted')
+                if use_prerank:
+                    texts[i] = resume_text
+                else:
+                    yield {'index': i, 'text': resume_text}
+        logger.info("Extraction cache: %s", extraction_cache.stats())
+        if not use_prerank:
+            return
+
+        with span('prerank', resumes=len(unique)):
+            scores = prerank.score(job_description, [texts[i] for i in unique])
+            shortlisted = set(prerank.shortlist(scores, PRERANK_SHORTLIST_RATIO, PRERANK_MIN_SHORTLIST,
+                                                PRERANK_MIN_SCORE))
+        logger.info("Pre-rank shortlisted %d of %d resumes", len(shortlisted), len(unique))
+        for k, score in enumerate(scores):
+            i = unique[k]
+            job.update(i, prerank_score=round(float(score) * 100, 1))
+            if k in shortlisted:
+                yield {'index': i, 'text': texts[i]}
+            else:
+                job.update(i, status=DONE, match_percentage='Not shortlisted')
+
+    def match(item):
+        job.update(item['index'], status='matching')
+        with span('match', filename=entries[item['index']]['filename']):
+            item['match_percentage'] = match_resume_with_job_description(job_description, item['text'])
+        job.update(item['index'], status='matched', match_percentage=item['match_percentage'])
+        return item
+
+    # Keep candidates with match percentage greater than 60%; a reply without one doesn't pass
+    def threshold(item):
+        score = parse_match_percentage(item['match_percentage'])
+        if score is not None and score > 60:
+            return item
+        job.update(item['index'], status=DONE)
+        return None
+
+    def questions(item):
+        job.update(item['index'], status='generating questions')
+        with span('questions', filename=entries[item['index']]['filename']):
+            item['questions'] = generate_test_questions(entries[item['index']]['filename'], job_description,
+                                                        item['text'])
+        return item
+
+    # Batched so that candidates finishing together are stored in one transaction;
+    # links only go live once they are stored
+    def create_test_links(items):
+        new_candidates = {}
+        for item in items:
+            entry = entries[item['index']]
+            item['test_link'] = generate_test_link(entry['filename'])
+            new_candidates[entry['candidate_id']] = {'display_name': entry['filename'], 'match_percentage': item['match_percentage'], 'test_link': item['test_link'], 'questions': item['questions'], 'status': 'Pending'}
+        with span('store_candidates', count=len(new_candidates)):
+            candidate_store.save_many(new_candidates)
+        for item in items:
+            job.update(item['index'], status=DONE, test_link=item['test_link'])
+        return items
+
+    def failed(item, exc):
+        job.update(item['index'], status=FAILED, error=str(exc))
+
+    screening = Pipeline([
+        Stage('match', match, workers=LLM_MAX_CONCURRENCY),
+        Stage('threshold', threshold),
+        Stage('questions', questions, workers=LLM_MAX_CONCURRENCY),
+        Stage('test_link', create_test_links, batch_size=50),
+    ], maxsize=PIPELINE_QUEUE_SIZE, on_error=failed)
+    for _ in screening.run(extracted()):
+        pass
+
+    snapshot = job.to_dict()['resumes']
+    for i, entry in enumerate(entries):
+        if entry['duplicate_of'] is not None:
+            original = snapshot[entry['duplicate_of']]
+            job.update(i, **{key: value for key, value in original.items() if key != 'filename'},
+                       duplicate_of=original['filename'])
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
         job_description = request.form['job_description']
         resumes = request.files.getlist('resumes')
 
-        results = []
-        for file in resumes:
-            if file:
-                filename = secure_filename(file.filename)
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(file_path)
-
-                resume_text = extract_text(file_path)
-                match_percentage = match_resume_with_job_description(job_description, resume_text)
-                
-                results.append({'filename': filename, 'match_percentage': match_percentage})
-        
-        # Filter candidates with match percentage greater than 60%
-        high_match_candidates = [result for result in results if float(result['match_percentage'].strip('%')) > 60]
-        
-        for candidate in high_match_candidates:
-            candidate_name = candidate['filename']
-            resume_text = extract_text(os.path.join(app.config['UPLOAD_FOLDER'], candidate_name))
-            questions = generate_test_questions(candidate_name, job_description, resume_text)
-            test_link = generate_test_link(candidate_name)
-            candidates[candidate_name] = {'match_percentage': candidate['match_percentage'], 'test_link': test_link, 'questions': questions, 'status': 'Pending'}
-
-        return render_template('results.html', results=results, candidates=candidates)
+        batch_id = uuid.uuid4().hex
+        with span('ingest', files=len(resumes)):
+            manifest = upload_ingestor.ingest(resumes, batch_id)
+        filenames = [entry['filename'] for entry in manifest['entries']]
+        with span('submit_job', job_id=batch_id):
+            job = screening_jobs.submit(screen_resumes, filenames, job_description, manifest, job_id=batch_id)
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify({'job_id': job.id, 'status_url': url_for('job_status_api', job_id=job.id)}), 202
+        return redirect(url_for('job_status', job_id=job.id))
 
     return render_template('index.html')
 
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    if screening_jobs.get(job_id) is None:
+        return "Job not found", 404
+    return render_template('job.html', job_id=job_id)
+
+@app.route('/api/jobs/<job_id>')
+def job_status_api(job_id):
+    job = screening_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+# Indexes every answer submitted before this process started; runs once, off the request thread
+def load_plagiarism_index():
+    for name, details in candidate_store.all(status='Submitted').items():
+        for question, answer in (details.get('answers') or {}).items():
+            if answer and (name, question) not in plagiarism_index:
+                plagiarism_index.add((name, question), answer)
+
+# Indexes answers submitted since the last sync, including those written by other worker processes
+def sync_plagiarism_index():
+    with plagiarism_lock:
+        if plagiarism_sync['loader'] is None:
+            plagiarism_sync['loader'] = threading.Thread(target=load_plagiarism_index, name='plagiarism-load',
+                                                         daemon=True)
+            plagiarism_sync['loader'].start()
+        started = time.time()
+        # Step back a little: another process may commit a row stamped just before our last sync
+        since = plagiarism_sync['since'] - 60
+        for name, details in candidate_store.all(status='Submitted', since=since).items():
+            for question, answer in (details.get('answers') or {}).items():
+                if answer and (name, question) not in plagiarism_index:
+                    plagiarism_index.add((name, question), answer)
+        plagiarism_sync['since'] = started
+
+# Compares a candidate's answers with everyone else's and indexes them
+def check_plagiarism(candidate_name, answers):
+    sync_plagiarism_index()
+    loader = plagiarism_sync['loader']
+    loader.join(PLAGIARISM_LOAD_WAIT)
+    findings = []
+    for question, answer in answers.items():
+        if not answer:
+            continue
+        matches = plagiarism_index.add_and_query((candidate_name, question), answer,
+                                                 threshold=PLAGIARISM_THRESHOLD,
+                                                 exclude=lambda key: key[0] == candidate_name)
+        if matches:
+            (other, other_question), similarity = matches[0]
+            other_details = candidate_store.get(other) or {}
+            findings.append(f"{question} matches {other_details.get('display_name', other)} {other_question} "
+                            f"(~{similarity:.0%} similar)")
+    if loader.is_alive():
+        return "Plagiarism check incomplete (earlier answers still loading)" + \
+            ("; possible plagiarism: " + "; ".join(findings) if findings else "")
+    if not findings:
+        return "No plagiarism detected"
+    return "Possible plagiarism: " + "; ".join(findings)
+
+# Summarises the AI verdicts for the dashboard
+def check_ai_generated(answers):
+    questions = list(answers)
+    verdicts = answer_checker.check([answers[question] for question in questions])
+    flagged = [f"{question} ({verdict.ai_confidence:.0%})" if verdict.ai_confidence is not None else question
+               for question, verdict in zip(questions, verdicts) if verdict.ai_generated]
+    unknown = [question for question, verdict in zip(questions, verdicts) if verdict.ai_generated is None]
+    if flagged:
+        return "Likely AI-generated: " + ", ".join(flagged)
+    if unknown:
+        return "AI check inconclusive: " + ", ".join(unknown)
+    return "No AI-generated content detected"
+
 @app.route('/test/<test_id>', methods=['GET', 'POST'])
 def test(test_id):
-    candidate_name = next((name for name, details in candidates.items() if details['test_link'].endswith(test_id)), None)
-    if not candidate_name:
+    found = candidate_store.get_by_test_id(test_id)
+    if not found:
         return "Test not found", 404
     
-    candidate_info = candidates[candidate_name]
+    candidate_name, candidate_info = found
     questions = candidate_info['questions']
 
     if request.method == 'POST':
         answers = {f"question_{i+1}": request.form.get(f"question_{i+1}") for i in range(10)}
-        candidate_info['answers'] = answers
-        candidate_info['status'] = 'Submitted'
-        # Here you would add logic to validate answers for plagiarism and AI-generated content
-        candidate_info['plagiarism_check_result'] = "No plagiarism detected"  # Placeholder for plagiarism result
-        candidate_info['ai_generated_check_result'] = "No AI-generated content detected"  # Placeholder for AI-generated check result
+        candidate_store.update(
+            candidate_name,
+            answers=answers,
+            status='Submitted',
+            plagiarism_check_result=check_plagiarism(candidate_name, answers),
+            ai_generated_check_result=check_ai_generated(answers),
+        )
         return redirect(url_for('dashboard'))
 
     return render_template('test.html', test_id=test_id, questions=questions)
 
+# The dashboard page loads candidates through the API below, one page at a time
 @app.route('/dashboard')
 def dashboard():
-    return render_template('dashboard.html', candidates=candidates)
+    return render_template('dashboard.html', page_size=DASHBOARD_PAGE_SIZE)
+
+def optional_float(name):
+    value = request.args.get(name, '').strip()
+    return float(value) if value else None
+
+# One page of candidate summaries. Query parameters: status, min_match, max_match,
+# sort (name, match, status or updated), order (asc or desc), page and per_page.
+# `version` is the change counter to pass to /api/candidates/changes next.
+@app.route('/api/candidates')
+def candidates_api():
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        per_page = min(max(int(request.args.get('per_page', DASHBOARD_PAGE_SIZE)), 1), DASHBOARD_MAX_PAGE_SIZE)
+        min_match = optional_float('min_match')
+        max_match = optional_float('max_match')
+    except ValueError:
+        return jsonify({'error': 'Invalid number'}), 400
+    sort = request.args.get('sort', 'name')
+    if sort not in SORT_COLUMNS:
+        return jsonify({'error': f"sort must be one of {', '.join(SORT_COLUMNS)}"}), 400
+    # Read the version first so no change made during the query is missed by the next poll
+    version = candidate_store.current_version()
+    total, candidates = candidate_store.page(status=request.args.get('status') or None,
+                                             min_match=min_match, max_match=max_match, sort=sort,
+                                             descending=request.args.get('order') == 'desc',
+                                             offset=(page - 1) * per_page, limit=per_page)
+    return jsonify({'version': version, 'total': total, 'page': page, 'per_page': per_page,
+                    'candidates': candidates})
+
+# Summaries of candidates changed after ?since=<version>; `more` means poll again right away
+@app.route('/api/candidates/changes')
+def candidate_changes_api():
+    try:
+        since = int(request.args.get('since', 0))
+    except ValueError:
+        return jsonify({'error': 'Invalid version'}), 400
+    changes, more = candidate_store.changes_since(since, limit=DASHBOARD_MAX_PAGE_SIZE)
+    version = changes[-1]['version'] if changes else since
+    return jsonify({'version': version, 'more': more, 'changes': changes})
+
+# Full record of one candidate, including questions and answers
+@app.route('/api/candidates/<candidate_name>')
+def candidate_api(candidate_name):
+    details = candidate_store.get(candidate_name)
+    if details is None:
+        return jsonify({'error': 'Candidate not found'}), 404
+    return jsonify({'name': candidate_name, **details})
+
+# Prometheus scrape endpoint
+@app.route('/metrics')
+def metrics():
+    return Response(llm_metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
     app.run(debug=True)
\ No newline at end of file
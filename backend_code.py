@@ -3,36 +3,32 @@ from flask import Flask, request, render_template, redirect, url_for
 from werkzeug.utils import secure_filename
 from azure.ai.openai import OpenAIClient
 from azure.core.credentials import AzureKeyCredential
-import docx2txt
-import PyPDF2
-import textract
+from extraction_pool import ExtractionPool
 
 app = Flask(__name__)
 
 # Azure OpenAI credentials (replace with your actual keys)
 api_key = os.getenv("AZURE_OPENAI_API_KEY")
 endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-client = OpenAIClient(endpoint=endpoint, credential=AzureKeyCredential(api_key))
 
 UPLOAD_FOLDER = 'uploads'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+# Bulk uploads are parsed in a process pool; EXTRACTION_TIMEOUT is per file, in seconds
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "60"))
 
-# Function to extract text from different resume formats
-def extract_text(file_path):
-    if file_path.endswith('.docx'):
-        return docx2txt.process(file_path)
-    elif file_path.endswith('.pdf'):
-        with open(file_path, 'rb') as pdf_file:
-            reader = PyPDF2.PdfFileReader(pdf_file)
-            text = ''
-            for page in range(reader.numPages):
-                text += reader.getPage(page).extract_text()
-            return text
-    else:
-        return textract.process(file_path).decode('utf-8')
+# Extraction workers re-run this script as __mp_main__ and only need resume_parser, so the
+# client and pool are built only in the app process
+def init_services():
+    global client, extraction_pool
+    client = OpenAIClient(endpoint=endpoint, credential=AzureKeyCredential(api_key))
+    if not os.path.exists(UPLOAD_FOLDER):
+        os.makedirs(UPLOAD_FOLDER)
+    extraction_pool = ExtractionPool(workers=EXTRACTION_WORKERS, timeout=EXTRACTION_TIMEOUT)
+
+if __name__ != '__mp_main__':
+    init_services()
 
 # Function to match resume with job description using Azure OpenAI
 def match_resume_with_job_description(job_description, resume_text):
@@ -61,17 +57,21 @@ def index():
         job_description = request.form['job_description']
         files = request.files.getlist('resumes')
         
-        results = []
+        filenames = []
+        file_paths = []
         for file in files:
             if file:
                 filename = secure_filename(file.filename)
                 file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
                 file.save(file_path)
-                
-                resume_text = extract_text(file_path)
-                match_percentage = match_resume_with_job_description(job_description, resume_text)
-                
-                results.append({'filename': filename, 'match_percentage': match_percentage})
+                filenames.append(filename)
+                file_paths.append(file_path)
+
+        # Match each resume as soon as its extraction finishes, keeping results in upload order
+        results = [None] * len(file_paths)
+        for i, file_path, resume_text in extraction_pool.extract(file_paths):
+            match_percentage = match_resume_with_job_description(job_description, resume_text)
+            results[i] = {'filename': filenames[i], 'match_percentage': match_percentage}
 
         return render_template('results.html', results=results)
 
@@ -0,0 +1,7 @@
+# Benchmarks for the screening app: a synthetic resume corpus (corpus.py),
+# extraction throughput (bench_extraction.py) and end-to-end screening against
+# the mock completions server (bench_screening.py), plus face detector
+# throughput per backend (bench_face_detectors.py) and detect-then-track
+# against full detection (bench_face_tracking.py). Run from the repo root:
+#
+#   python -m benchmarks.run --count 60 --pages 2 --output baseline.json
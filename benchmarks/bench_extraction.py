@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+from benchmarks.corpus import FORMATS, generate_corpus
+from benchmarks.measure import best_of, metric, peak_rss_mb
+
+# Extraction throughput: resume_parser.extract_text() on one process per
+# format, then the whole corpus through ExtractionPool (without the cache, so
+# every file is parsed). Files that come back empty count as failures.
+
+
+def run(count=60, pages=2, formats=FORMATS, workers=None, repeat=3):
+    from extraction_pool import ExtractionPool
+    from resume_parser import extract_text
+
+    metrics = {}
+    with tempfile.TemporaryDirectory(prefix='bench-extraction-') as corpus_dir:
+        paths = generate_corpus(corpus_dir, count, pages=pages, formats=formats)
+        for fmt in formats:
+            files = [path for path in paths if path.endswith(f".{fmt}")]
+            if not files:
+                continue
+            seconds, texts = best_of(lambda: [extract_text(path) for path in files], repeat)
+            metrics[f"extract_{fmt}_files_per_sec"] = metric(len(files) / seconds, 'files/s')
+            metrics[f"extract_{fmt}_failures"] = metric(sum(1 for text in texts if not text), 'files', 'lower')
+
+        pool = ExtractionPool(workers=workers, timeout=60)
+        try:
+            # Warm the pool once so process start-up isn't counted
+            list(pool.extract(paths[:pool.workers]))
+            seconds, results = best_of(lambda: list(pool.extract(paths)), repeat)
+        finally:
+            pool.shutdown()
+        metrics['pool_files_per_sec'] = metric(len(paths) / seconds, 'files/s')
+        metrics['pool_failures'] = metric(sum(1 for _, _, text in results if not text), 'files', 'lower')
+
+    own, children = peak_rss_mb()
+    metrics['peak_rss_mb'] = metric(own, 'MiB', 'lower')
+    metrics['peak_worker_rss_mb'] = metric(children, 'MiB', 'lower')
+    return {'suite': 'extraction',
+            'params': {'count': count, 'pages': pages, 'formats': ','.join(formats),
+                       'workers': workers or os.cpu_count()},
+            'metrics': metrics}
@@ -0,0 +1,55 @@
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.measure import best_of, metric, peak_rss_mb
+
+# Face detection throughput per backend on CPU: frames/s over the same set of
+# frames, faces found per frame, and the one-off load time that the per-thread
+# registry in face_detectors.py saves on every call after the first.
+#
+# Frames come from `video` (sampled at 2 fps, at most 640 wide, as the video
+# analysis does) or, without one, are synthetic noise; pass a real interview
+# clip for representative numbers. Backends that can't load here (mtcnn not
+# installed, dnn model files missing) are skipped with a note on stderr.
+
+
+def load_frames(video=None, count=50):
+    if video:
+        from media_pipeline import FrameSampling
+        from video_ui_utils import iter_frames
+        frames = []
+        for _, frame in iter_frames(video, FrameSampling(fps=2, max_width=640)):
+            frames.append(frame)
+            if len(frames) == count:
+                break
+        return frames
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (360, 640, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def run(video=None, count=50, backends=None, repeat=3):
+    import face_detectors
+
+    frames = load_frames(video, count)
+    metrics = {}
+    for name in backends or sorted(face_detectors.DETECTORS):
+        started = time.perf_counter()
+        try:
+            detector = face_detectors.get_detector(name)
+        except Exception as e:
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+            continue
+        metrics[f"{name}_load_ms"] = metric((time.perf_counter() - started) * 1000, 'ms', 'lower')
+        detector.detect(frames[0])
+        seconds, faces = best_of(lambda: [detector.detect(frame) for frame in frames], repeat)
+        metrics[f"{name}_fps"] = metric(len(frames) / seconds, 'frames/s')
+        metrics[f"{name}_faces_per_frame"] = metric(sum(map(len, faces)) / len(frames), 'faces', 'same')
+
+    own, _ = peak_rss_mb()
+    metrics['peak_rss_mb'] = metric(own, 'MiB', 'lower')
+    return {'suite': 'faces',
+            'params': {'video': video or 'synthetic', 'frames': len(frames),
+                       'size': 'x'.join(map(str, frames[0].shape[1::-1]))},
+            'metrics': metrics}
@@ -0,0 +1,87 @@
+import time
+
+from benchmarks.measure import metric, peak_rss_mb
+
+# Detect-then-track against full detection on the same clip: throughput of
+# each, how many frames the tracker didn't send to the detector, and how
+# closely its boxes follow the ones full detection finds on every frame.
+#
+# Accuracy is measured on boxes, with full detection as the reference: recall
+# is the fraction of reference faces matched by a tracked box at IoU >= 0.5,
+# mean_iou averages over those matches, and extra_faces counts tracked boxes
+# with no reference face. Needs a real clip with a face in it (--video).
+
+MATCH_IOU = 0.5
+
+
+def iou(a, b):
+    ax1, ay1, bx1, by1 = a[0] + a[2], a[1] + a[3], b[0] + b[2], b[1] + b[3]
+    w = min(ax1, bx1) - max(a[0], b[0])
+    h = min(ay1, by1) - max(a[1], b[1])
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    return inter / (a[2] * a[3] + b[2] * b[3] - inter)
+
+
+# Greedy one-to-one matching; returns the IoUs of the matched pairs
+def match(reference, boxes):
+    pairs = sorted(((iou(r, b), i, j) for i, r in enumerate(reference) for j, b in enumerate(boxes)), reverse=True)
+    used_r, used_b, matched = set(), set(), []
+    for overlap, i, j in pairs:
+        if overlap < MATCH_IOU:
+            break
+        if i not in used_r and j not in used_b:
+            used_r.add(i)
+            used_b.add(j)
+            matched.append(overlap)
+    return matched
+
+
+def detect_all(detector, frames):
+    import cv2
+    started = time.perf_counter()
+    boxes = [detector.detect(frame, cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)) for frame in frames]
+    return time.perf_counter() - started, boxes
+
+
+def run(video, count=300, backend='haar', detect_every=5, min_confidence=0.6, fps=1.0):
+    if not video:
+        raise ValueError("The tracking suite needs a clip with a face in it (--video)")
+    from face_detectors import get_detector
+    from face_tracking import FaceTracker
+    from media_pipeline import FrameSampling
+    from video_ui_utils import iter_frames
+
+    frames = []
+    for _, frame in iter_frames(video, FrameSampling(fps=fps, max_width=640)):
+        frames.append(frame)
+        if len(frames) == count:
+            break
+
+    detector = get_detector(backend)
+    detector.detect(frames[0])
+    full_seconds, reference = detect_all(detector, frames)
+    tracker = FaceTracker(detector, detect_every, min_confidence)
+    tracked_seconds, tracked = detect_all(tracker, frames)
+
+    matched = []
+    expected = found = 0
+    for ref, boxes in zip(reference, tracked):
+        matched += match(ref, boxes)
+        expected += len(ref)
+        found += len(boxes)
+
+    own, _ = peak_rss_mb()
+    return {'suite': 'tracking',
+            'params': {'video': video, 'frames': len(frames), 'fps': fps, 'backend': backend,
+                       'detect_every': detect_every, 'min_confidence': min_confidence},
+            'metrics': {
+                'full_detection_fps': metric(len(frames) / full_seconds, 'frames/s'),
+                'tracked_fps': metric(len(frames) / tracked_seconds, 'frames/s'),
+                'detect_skip_ratio': metric(tracker.skip_ratio, 'ratio'),
+                'recall': metric(len(matched) / expected if expected else 1.0, 'ratio'),
+                'mean_iou': metric(sum(matched) / len(matched) if matched else 0.0, 'ratio'),
+                'extra_faces': metric(found - len(matched), 'faces', 'lower'),
+                'peak_rss_mb': metric(own, 'MiB', 'lower'),
+            }}
@@ -0,0 +1,71 @@
+import importlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import FORMATS, generate_corpus
+from benchmarks.measure import metric, peak_rss_mb
+
+# End-to-end screening throughput: uploads a synthetic batch to app.py's
+# index() through the Flask test client and waits for the background job,
+# with completions served by the local mock server. The app is imported in a
+# scratch working directory with its own upload folder, caches and candidate
+# database, and the completion cache bypassed so every call reaches the mock.
+
+
+def run(count=60, pages=2, formats=FORMATS, latency=0.2, timeout=600):
+    from mock_completions_server import MockCompletionsServer
+
+    server = MockCompletionsServer(latency=latency).start()
+    workdir = tempfile.mkdtemp(prefix='bench-screening-')
+    previous_dir = os.getcwd()
+    os.environ.update({
+        'AZURE_OPENAI_ENDPOINT': server.url,
+        'AZURE_OPENAI_API_KEY': os.getenv('AZURE_OPENAI_API_KEY', 'benchmark'),
+        'LLM_CACHE_BYPASS': '1',
+        'LLM_CACHE_PATH': os.path.join(workdir, 'llm.sqlite3'),
+        'EXTRACTION_CACHE_DIR': os.path.join(workdir, 'extracted'),
+        'CANDIDATE_DB_PATH': os.path.join(workdir, 'candidates.sqlite3'),
+        'SCREENING_JOB_DB_PATH': os.path.join(workdir, 'screening_jobs.sqlite3'),
+    })
+    os.chdir(workdir)
+    try:
+        app_module = importlib.import_module('app')
+        paths = generate_corpus(os.path.join(workdir, 'corpus'), count, pages=pages, formats=formats)
+        uploads = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                uploads.append((io.BytesIO(f.read()), os.path.basename(path)))
+
+        client = app_module.app.test_client()
+        started = time.perf_counter()
+        response = client.post('/', data={'job_description': 'Backend Python developer with Flask, SQL and AWS',
+                                          'resumes': uploads},
+                               content_type='multipart/form-data', headers={'Accept': 'application/json'})
+        accepted = time.perf_counter() - started
+        job = app_module.screening_jobs.get(response.get_json()['job_id'])
+        while job.status not in (app_module.DONE, app_module.FAILED):
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"Screening did not finish within {timeout}s")
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - started
+        summary = job.to_dict()
+        # Reap the extraction workers so RUSAGE_CHILDREN includes them
+        app_module.extraction_pool.shutdown()
+    finally:
+        os.chdir(previous_dir)
+        server.shutdown()
+
+    own, children = peak_rss_mb()
+    failed = sum(1 for resume in summary['resumes'] if resume['status'] == app_module.FAILED)
+    return {'suite': 'screening',
+            'params': {'count': count, 'pages': pages, 'formats': ','.join(formats), 'latency': latency},
+            'metrics': {
+                'resumes_per_min': metric(count / elapsed * 60, 'resumes/min'),
+                'upload_accept_ms': metric(accepted * 1000, 'ms', 'lower'),
+                'completion_requests': metric(server.requests, 'requests', 'lower'),
+                'failed_resumes': metric(failed, 'resumes', 'lower'),
+                'peak_rss_mb': metric(own, 'MiB', 'lower'),
+                'peak_worker_rss_mb': metric(children, 'MiB', 'lower'),
+            }}
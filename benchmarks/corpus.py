@@ -0,0 +1,140 @@
+import argparse
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+# Synthetic resume corpus for the benchmarks.
+#
+# Resumes are generated from a seed, so a corpus is reproducible, and written
+# without any third-party library: PDFs are assembled by hand (one Helvetica
+# text stream per page, which PyPDF2 can extract), DOCX files are the minimal
+# zip of XML parts docx2txt reads, and TXT is plain text.
+#
+#   python -m benchmarks.corpus --out /tmp/resumes --count 100 --pages 2 --formats pdf,docx,txt
+
+FORMATS = ('pdf', 'docx', 'txt')
+LINES_PER_PAGE = 48
+
+FIRST_NAMES = ('Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn')
+LAST_NAMES = ('Smith', 'Garcia', 'Chen', 'Okafor', 'Novak', 'Patel', 'Kim', 'Silva', 'Müller', 'Haddad')
+SKILLS = ('Python', 'Java', 'SQL', 'Flask', 'Django', 'React', 'AWS', 'Azure', 'Docker', 'Kubernetes',
+          'Spark', 'Airflow', 'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'Terraform', 'Go', 'C++', 'Node.js')
+ROLES = ('Software Engineer', 'Data Engineer', 'Backend Developer', 'Machine Learning Engineer',
+         'DevOps Engineer', 'Full Stack Developer', 'Data Analyst')
+VERBS = ('Built', 'Designed', 'Led', 'Migrated', 'Optimised', 'Automated', 'Maintained', 'Scaled')
+OBJECTS = ('a data pipeline', 'the billing service', 'an internal API', 'the CI/CD workflow',
+           'a recommendation model', 'the reporting dashboard', 'a streaming ingestion job')
+OUTCOMES = ('cutting latency by {n}%', 'serving {n}k requests per day', 'saving {n} hours a week',
+            'reducing cloud spend by {n}%', 'for {n} internal teams')
+
+
+# Returns a list of pages, each a list of lines
+def generate_resume(seed, pages=1):
+    rng = random.Random(seed)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [name, rng.choice(ROLES), f"{name.split()[0].lower()}{seed}@example.com", '',
+             'Summary', f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience in "
+             f"{', '.join(rng.sample(SKILLS, 3))}.", '',
+             'Skills', ', '.join(rng.sample(SKILLS, rng.randint(5, 10))), '', 'Experience']
+    while len(lines) < pages * LINES_PER_PAGE - 6:
+        lines.append(f"{rng.choice(ROLES)}, Company {rng.randint(1, 500)} ({rng.randint(2005, 2020)} - "
+                     f"{rng.randint(2021, 2024)})")
+        for _ in range(rng.randint(2, 4)):
+            outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} with {rng.choice(SKILLS)}, {outcome}.")
+        lines.append('')
+    lines += ['Education', f"B.Sc. Computer Science, University {rng.randint(1, 80)}"]
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)][:max(pages, 1)]
+
+
+def _pdf_string(text):
+    # Helvetica in a PDF uses a Latin-1 style encoding; escape the string delimiters
+    data = text.encode('latin-1', 'replace')
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def write_pdf(path, pages):
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in pages:
+        stream = b"BT /F1 10 Tf 12 TL 50 790 Td " + b" ".join(b"(" + _pdf_string(line) + b") Tj T*" for line in page) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+
+def write_docx(path, pages):
+    paragraphs = []
+    for number, page in enumerate(pages):
+        if number:
+            paragraphs.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+        paragraphs.extend(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in page)
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+                + ''.join(paragraphs) + '</w:body></w:document>')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('[Content_Types].xml', DOCX_CONTENT_TYPES)
+        docx.writestr('_rels/.rels', DOCX_RELS)
+        docx.writestr('word/document.xml', document)
+
+
+def write_txt(path, pages):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n\f\n'.join('\n'.join(page) for page in pages))
+
+
+WRITERS = {'pdf': write_pdf, 'docx': write_docx, 'txt': write_txt}
+
+
+# Writes `count` resumes cycling through `formats`; returns their paths
+def generate_corpus(out_dir, count, pages=1, formats=FORMATS, seed=0):
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(count):
+        fmt = formats[i % len(formats)]
+        path = os.path.join(out_dir, f"resume_{seed + i:05d}.{fmt}")
+        WRITERS[fmt](path, generate_resume(seed + i, pages))
+        paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic resume corpus')
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--count', type=int, default=100)
+    parser.add_argument('--pages', type=int, default=1)
+    parser.add_argument('--formats', default=','.join(FORMATS))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    paths = generate_corpus(args.out, args.count, args.pages, args.formats.split(','), args.seed)
+    print(f"Wrote {len(paths)} resumes to {args.out}")
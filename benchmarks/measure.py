@@ -0,0 +1,62 @@
+import resource
+import sys
+import time
+
+# Shared measurement helpers: timing, peak RSS and baseline comparison.
+#
+# A suite returns {'suite': name, 'params': {...}, 'metrics': {name: metric}}
+# where each metric is {'value', 'unit', 'better'} and `better` says which
+# direction is an improvement ('higher' or 'lower'), so compare() can flag
+# regressions either way; 'same' marks a metric that is only informational.
+
+
+def metric(value, unit, better='higher'):
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+# Peak resident set size in MiB of this process and of its reaped children
+# (e.g. extraction pool workers). ru_maxrss is KiB on Linux and bytes on macOS.
+def peak_rss_mb():
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return own * scale / 2 ** 20, children * scale / 2 ** 20
+
+
+# Best wall time of `repeat` runs of fn(), in seconds, and the last result
+def best_of(fn, repeat=3):
+    best = None
+    result = None
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+# Returns a list of (suite, metric, baseline value, value, change) for every
+# metric that got worse than `baseline` by more than `max_regression` (a fraction)
+def compare(results, baseline, max_regression=0.15):
+    previous = {(suite['suite'], name): m for suite in baseline for name, m in suite['metrics'].items()}
+    regressions = []
+    for suite in results:
+        for name, m in suite['metrics'].items():
+            old = previous.get((suite['suite'], name))
+            if old is None or not old['value'] or m['better'] == 'same':
+                continue
+            change = (m['value'] - old['value']) / old['value']
+            worse = -change if m['better'] == 'higher' else change
+            if worse > max_regression:
+                regressions.append((suite['suite'], name, old['value'], m['value'], change))
+    return regressions
+
+
+def format_results(results):
+    lines = []
+    for suite in results:
+        params = ', '.join(f"{key}={value}" for key, value in suite['params'].items())
+        lines.append(f"{suite['suite']} ({params})")
+        for name, m in suite['metrics'].items():
+            lines.append(f"  {name:<40} {m['value']:>12.2f} {m['unit']}")
+    return '\n'.join(lines)
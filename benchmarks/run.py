@@ -0,0 +1,92 @@
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.corpus import FORMATS
+from benchmarks.measure import compare, format_results
+
+# Runs the benchmark suites and optionally checks them against a baseline.
+#
+# Each suite runs in its own interpreter so peak RSS is per suite and the app
+# is imported fresh. Save a run with --output and pass it as --baseline later;
+# the exit status is 1 if any metric regressed by more than --max-regression.
+#
+#   python -m benchmarks.run --count 60 --pages 2 --output baseline.json
+#   python -m benchmarks.run --count 60 --pages 2 --baseline baseline.json
+#   python -m benchmarks.run --suites faces,tracking --video interview.mp4
+
+SUITES = ('extraction', 'screening', 'faces', 'tracking')
+DEFAULT_SUITES = ('extraction', 'screening')
+
+
+def run_suite(name, args):
+    if name == 'extraction':
+        from benchmarks import bench_extraction
+        return bench_extraction.run(args.count, args.pages, args.formats, args.workers, args.repeat)
+    if name == 'faces':
+        from benchmarks import bench_face_detectors
+        return bench_face_detectors.run(args.video, args.frames, repeat=args.repeat)
+    if name == 'tracking':
+        from benchmarks import bench_face_tracking
+        return bench_face_tracking.run(args.video, args.frames, args.detector, args.detect_every)
+    from benchmarks import bench_screening
+    return bench_screening.run(args.count, args.pages, args.formats, args.latency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resume screening benchmarks')
+    parser.add_argument('--suites', default=','.join(DEFAULT_SUITES), help=f"any of {', '.join(SUITES)}")
+    parser.add_argument('--count', type=int, default=60, help='resumes in the synthetic corpus')
+    parser.add_argument('--pages', type=int, default=2, help='pages per resume')
+    parser.add_argument('--formats', default=','.join(FORMATS))
+    parser.add_argument('--workers', type=int, default=None, help='extraction pool size')
+    parser.add_argument('--repeat', type=int, default=3, help='extraction runs; the best is reported')
+    parser.add_argument('--latency', type=float, default=0.2, help='mock completion latency, in seconds')
+    parser.add_argument('--video', help='clip for the faces suite; synthetic frames without one')
+    parser.add_argument('--frames', type=int, default=50, help='frames per face detector')
+    parser.add_argument('--detector', default='haar', help='backend for the tracking suite')
+    parser.add_argument('--detect-every', type=int, default=5, help='tracking suite detection interval')
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.15)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.formats = args.formats.split(',')
+    suites = args.suites.split(',')
+
+    if args.child:
+        print(json.dumps(run_suite(suites[0], args)))
+        return 0
+
+    results = []
+    options = [f"--count={args.count}", f"--pages={args.pages}", f"--formats={','.join(args.formats)}",
+               f"--repeat={args.repeat}", f"--latency={args.latency}"]
+    if args.workers:
+        options.append(f"--workers={args.workers}")
+    if args.video:
+        options.append(f"--video={args.video}")
+    options += [f"--frames={args.frames}", f"--detector={args.detector}", f"--detect-every={args.detect_every}"]
+    for name in suites:
+        if name not in SUITES:
+            parser.error(f"unknown suite {name}")
+        out = subprocess.run([sys.executable, '-m', 'benchmarks.run', '--child', f"--suites={name}"] + options,
+                             stdout=subprocess.PIPE, check=True, text=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for suite, name, old, new, change in regressions:
+            print(f"REGRESSION {suite}.{name}: {old:.2f} -> {new:.2f} ({change:+.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,306 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# SQLite-backed candidate repository, replacing the module-level `candidates` dict.
+#
+# Candidates survive restarts and are shared by every worker process using the
+# same database file (WAL mode). test_id is a unique index, so opening a test
+# is a single indexed lookup, and status is indexed for the dashboard. Reads
+# go through an in-process cache that is dropped whenever another process
+# commits (SQLite bumps PRAGMA data_version for changes made by other
+# connections); writes from this process update the cache directly.
+#
+# Every write also stamps the rows it touches with the next value of a global
+# version counter and keeps a numeric copy of the match percentage, so the
+# dashboard can page, sort and filter on the server and then poll for only
+# the rows changed since the version it last saw.
+
+# Columns stored as JSON text
+JSON_FIELDS = ('questions', 'answers')
+FIELDS = ('test_id', 'test_link', 'match_percentage', 'status', 'questions', 'answers',
+          'plagiarism_check_result', 'ai_generated_check_result', 'display_name')
+# Columns returned by page() and changes_since(); questions and answers are left out
+SUMMARY_FIELDS = ('display_name', 'match_percentage', 'match_score', 'status', 'test_link',
+                  'plagiarism_check_result', 'ai_generated_check_result', 'version')
+# `name` is the unique candidate key; display_name is what the dashboard shows and sorts by
+SORT_COLUMNS = {'name': 'COALESCE(display_name, name)', 'match': 'match_score', 'status': 'status', 'updated': 'updated_at'}
+
+PERCENT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+
+
+# Numeric match percentage from the model's free-text answer, or None
+def parse_match_percentage(text):
+    if text is None:
+        return None
+    match = PERCENT_RE.search(text)
+    try:
+        return float(match.group(1) if match else text.strip())
+    except ValueError:
+        return None
+
+
+def test_id_from_link(test_link):
+    return test_link.rstrip('/').rsplit('/', 1)[-1]
+
+
+class CandidateStore:
+    def __init__(self, path):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS candidates (
+                name TEXT PRIMARY KEY,
+                test_id TEXT,
+                test_link TEXT,
+                match_percentage TEXT,
+                status TEXT,
+                questions TEXT,
+                answers TEXT,
+                plagiarism_check_result TEXT,
+                ai_generated_check_result TEXT,
+                updated_at REAL NOT NULL,
+                match_score REAL,
+                version INTEGER NOT NULL DEFAULT 0,
+                display_name TEXT
+            );
+        """)
+        self._migrate()
+        self._conn.executescript("""
+            CREATE UNIQUE INDEX IF NOT EXISTS candidates_test_id ON candidates (test_id);
+            CREATE INDEX IF NOT EXISTS candidates_status ON candidates (status, match_score);
+            CREATE INDEX IF NOT EXISTS candidates_match_score ON candidates (match_score);
+            CREATE INDEX IF NOT EXISTS candidates_updated_at ON candidates (updated_at);
+            CREATE INDEX IF NOT EXISTS candidates_version ON candidates (version);
+        """)
+        self._conn.commit()
+        self._cache = {}  # name -> details
+        self._test_ids = {}  # test_id -> name
+        self._data_version = self._current_data_version()
+
+    # Adds the columns introduced after the first schema to existing databases
+    def _migrate(self):
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(candidates)")}
+        if 'match_score' not in columns:
+            self._conn.execute("ALTER TABLE candidates ADD COLUMN match_score REAL")
+            rows = self._conn.execute("SELECT name, match_percentage FROM candidates").fetchall()
+            self._conn.executemany("UPDATE candidates SET match_score = ? WHERE name = ?",
+                                   [(parse_match_percentage(text), name) for name, text in rows])
+        if 'version' not in columns:
+            self._conn.execute("ALTER TABLE candidates ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        if 'display_name' not in columns:
+            self._conn.execute("ALTER TABLE candidates ADD COLUMN display_name TEXT")
+        # The old single-column status index is replaced by (status, match_score)
+        index = self._conn.execute("SELECT sql FROM sqlite_master WHERE name = 'candidates_status'").fetchone()
+        if index and 'match_score' not in index[0]:
+            self._conn.execute("DROP INDEX candidates_status")
+        self._conn.commit()
+
+    # Starts a write transaction and returns the version for the rows it writes.
+    # BEGIN IMMEDIATE takes the write lock first, so concurrent writers in other
+    # processes can't hand out the same version.
+    def _begin_write(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM candidates").fetchone()[0]
+
+    def _current_data_version(self):
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # Drops the read cache if another process has committed since we last looked
+    def _check_cache(self):
+        version = self._current_data_version()
+        if version != self._data_version:
+            self._cache.clear()
+            self._test_ids.clear()
+            self._data_version = version
+
+    def _remember(self, name, details):
+        self._forget(name)
+        self._cache[name] = details
+        if details.get('test_id'):
+            self._test_ids[details['test_id']] = name
+
+    # Drops a cached candidate along with its test_id entry, so a rewritten
+    # row can't leave its old link pointing at the new record
+    def _forget(self, name):
+        old = self._cache.pop(name, None)
+        if old and self._test_ids.get(old.get('test_id')) == name:
+            del self._test_ids[old['test_id']]
+
+    @staticmethod
+    def _row_to_details(row):
+        details = {}
+        for field, value in zip(FIELDS, row[1:]):
+            if field in JSON_FIELDS and value is not None:
+                value = json.loads(value)
+            if value is not None:
+                details[field] = value
+        return row[0], details
+
+    @staticmethod
+    def _details_to_row(name, details):
+        details = dict(details)
+        if details.get('test_link') and not details.get('test_id'):
+            details['test_id'] = test_id_from_link(details['test_link'])
+        values = []
+        for field in FIELDS:
+            value = details.get(field)
+            if field in JSON_FIELDS and value is not None:
+                value = json.dumps(value)
+            values.append(value)
+        return details, (name, *values, time.time())
+
+    def _select(self, where, params):
+        columns = ', '.join(('name',) + FIELDS)
+        return self._conn.execute(f"SELECT {columns} FROM candidates WHERE {where}", params).fetchone()
+
+    def get(self, name):
+        with self._lock:
+            self._check_cache()
+            if name not in self._cache:
+                row = self._select("name = ?", (name,))
+                if row is None:
+                    return None
+                self._remember(*self._row_to_details(row))
+            return dict(self._cache[name])
+
+    # Returns (name, details) for a test id, or None
+    def get_by_test_id(self, test_id):
+        with self._lock:
+            self._check_cache()
+            name = self._test_ids.get(test_id)
+            if name is None or self._cache.get(name, {}).get('test_id') != test_id:
+                self._test_ids.pop(test_id, None)
+                row = self._select("test_id = ?", (test_id,))
+                if row is None:
+                    return None
+                name, details = self._row_to_details(row)
+                self._remember(name, details)
+            return name, dict(self._cache[name])
+
+    # Inserts or overwrites several candidates in one transaction
+    def save_many(self, candidates):
+        rows = []
+        saved = {}
+        for name, details in candidates.items():
+            details, row = self._details_to_row(name, details)
+            saved[name] = details
+            rows.append(row)
+        columns = FIELDS + ('updated_at', 'match_score', 'version')
+        placeholders = ', '.join('?' * (len(columns) + 1))
+        assignments = ', '.join(f"{field} = excluded.{field}" for field in columns)
+        with self._lock:
+            with self._conn:
+                version = self._begin_write()
+                self._conn.executemany(
+                    f"INSERT INTO candidates (name, {', '.join(columns)}) VALUES ({placeholders}) "
+                    f"ON CONFLICT (name) DO UPDATE SET {assignments}",
+                    [row + (parse_match_percentage(saved[row[0]].get('match_percentage')), version) for row in rows])
+            self._check_cache()
+            for name, details in saved.items():
+                self._remember(name, details)
+
+    # Updates only the given fields, so concurrent writers touching different
+    # fields of the same candidate don't overwrite each other
+    def update(self, name, **fields):
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown candidate fields: {', '.join(sorted(unknown))}")
+        values = [json.dumps(value) if field in JSON_FIELDS and value is not None else value
+                  for field, value in fields.items()]
+        assignments = [f"{field} = ?" for field in fields]
+        if 'match_percentage' in fields:
+            assignments.append("match_score = ?")
+            values.append(parse_match_percentage(fields['match_percentage']))
+        with self._lock:
+            with self._conn:
+                version = self._begin_write()
+                cursor = self._conn.execute(
+                    f"UPDATE candidates SET {', '.join(assignments)}, updated_at = ?, version = ? WHERE name = ?",
+                    (*values, time.time(), version, name))
+            if cursor.rowcount == 0:
+                raise KeyError(name)
+            self._forget(name)
+            return self.get(name)
+
+    # Every candidate as {name: details}, optionally only those with `status`
+    # and/or written at or after the `since` timestamp
+    def all(self, status=None, since=None):
+        columns = ', '.join(('name',) + FIELDS)
+        query = f"SELECT {columns} FROM candidates"
+        conditions = []
+        params = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if since is not None:
+            conditions.append("updated_at >= ?")
+            params.append(since)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY rowid", params).fetchall()
+        return dict(self._row_to_details(row) for row in rows)
+
+    def current_version(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(version), 0) FROM candidates").fetchone()[0]
+
+    @staticmethod
+    def _summary(row):
+        summary = {'name': row[0]}
+        summary.update(zip(SUMMARY_FIELDS, row[1:]))
+        return summary
+
+    # One page of candidate summaries (no questions or answers), filtered by
+    # status and match range and sorted on the server. `sort` is a key of
+    # SORT_COLUMNS; candidates without a match score sort last. Returns
+    # (total matching candidates, summaries).
+    def page(self, status=None, min_match=None, max_match=None, sort='name', descending=False, offset=0, limit=50):
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        conditions = []
+        params = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if min_match is not None:
+            conditions.append("match_score >= ?")
+            params.append(min_match)
+        if max_match is not None:
+            conditions.append("match_score <= ?")
+            params.append(max_match)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        direction = "DESC" if descending else "ASC"
+        column = SORT_COLUMNS[sort]
+        order = f"{column} IS NULL, {column} {direction}, name {direction}"
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM candidates{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT name, {', '.join(SUMMARY_FIELDS)} FROM candidates{where} ORDER BY {order} LIMIT ? OFFSET ?",
+                (*params, limit, offset)).fetchall()
+        return total, [self._summary(row) for row in rows]
+
+    # Summaries of candidates written after `version`, oldest change first, and
+    # whether there are more. A batch stops at a version boundary (one save_many
+    # shares a version), so the last version returned is always complete.
+    def changes_since(self, version, limit=500):
+        columns = ', '.join(SUMMARY_FIELDS)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT name, {columns} FROM candidates WHERE version > ? ORDER BY version LIMIT ?",
+                (version, limit + 1)).fetchall()
+            more = len(rows) > limit
+            if more:
+                last = rows[limit - 1][-1]
+                rows = [row for row in rows if row[-1] < last] + self._conn.execute(
+                    f"SELECT name, {columns} FROM candidates WHERE version = ?", (last,)).fetchall()
+        return [self._summary(row) for row in rows], more
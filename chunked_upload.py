@@ -0,0 +1,131 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+
+# Resumable chunked uploads written straight to disk.
+#
+# An upload is a `<id>.part` file under `root`; its size is the offset the
+# server has received. The client appends raw chunks at that offset (a chunk
+# resent at an earlier offset overwrites from there, so retrying is safe), can
+# ask for the offset after a dropped connection and carry on from it, and
+# finally hands over the SHA-256 of the whole file. finish() checks that digest
+# and moves the file into place, so a truncated or corrupted upload is never
+# mistaken for a complete one.
+
+CHUNK_READ_SIZE = 64 * 1024
+UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadError(Exception):
+    pass
+
+
+class UnknownUpload(UploadError):
+    pass
+
+
+# The chunk's offset is past the end of what the server has; `offset` is
+# where the client should resume from
+class OffsetMismatch(UploadError):
+    def __init__(self, offset):
+        super().__init__(f"Expected a chunk at offset {offset} or earlier")
+        self.offset = offset
+
+
+class UploadTooLarge(UploadError):
+    pass
+
+
+class ChecksumMismatch(UploadError):
+    pass
+
+
+class UploadStore:
+    def __init__(self, root, max_bytes=500 * 1024 * 1024, max_age=24 * 3600):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, upload_id):
+        if not UPLOAD_ID_RE.match(upload_id or ''):
+            raise UnknownUpload(f"Invalid upload id: {upload_id!r}")
+        return os.path.join(self.root, f"{upload_id}.part")
+
+    def _lock(self, upload_id):
+        with self._locks_lock:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    # Starts a new upload and returns its id; abandoned uploads older than
+    # max_age are removed on the way
+    def create(self):
+        self.purge()
+        upload_id = uuid.uuid4().hex
+        open(self._path(upload_id), 'xb').close()
+        return upload_id
+
+    # Bytes received so far
+    def offset(self, upload_id):
+        try:
+            return os.path.getsize(self._path(upload_id))
+        except FileNotFoundError:
+            raise UnknownUpload(f"No such upload: {upload_id}")
+
+    # Streams `stream` (a file-like object, e.g. request.stream) into the
+    # upload at `offset` and returns the new offset. Whatever was read before
+    # the stream broke off stays on disk and counts towards the offset.
+    def write_chunk(self, upload_id, offset, stream):
+        path = self._path(upload_id)
+        with self._lock(upload_id):
+            current = self.offset(upload_id)
+            if offset < 0 or offset > current:
+                raise OffsetMismatch(current)
+            with open(path, 'r+b') as f:
+                f.seek(offset)
+                written = offset
+                try:
+                    while True:
+                        block = stream.read(CHUNK_READ_SIZE)
+                        if not block:
+                            break
+                        written += len(block)
+                        if written > self.max_bytes:
+                            raise UploadTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+                        f.write(block)
+                finally:
+                    # Drop whatever a longer, earlier attempt left past this chunk
+                    if written < current:
+                        f.truncate()
+            return self.offset(upload_id)
+
+    # Verifies the SHA-256 hex digest of the whole upload and moves it to `dest`
+    def finish(self, upload_id, sha256, dest):
+        path = self._path(upload_id)
+        with self._lock(upload_id):
+            digest = hashlib.sha256()
+            try:
+                with open(path, 'rb') as f:
+                    for block in iter(lambda: f.read(CHUNK_READ_SIZE), b''):
+                        digest.update(block)
+            except FileNotFoundError:
+                raise UnknownUpload(f"No such upload: {upload_id}")
+            if digest.hexdigest() != (sha256 or '').lower():
+                raise ChecksumMismatch(f"Checksum mismatch for upload {upload_id}")
+            os.replace(path, dest)
+        with self._locks_lock:
+            self._locks.pop(upload_id, None)
+        return dest
+
+    def purge(self):
+        cutoff = time.time() - self.max_age
+        for entry in os.scandir(self.root):
+            if entry.name.endswith('.part') and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
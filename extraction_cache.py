@@ -0,0 +1,136 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# Content-addressed cache for extracted resume text.
+#
+# Entries live on disk as <cache_dir>/<digest[:2]>/<digest>.txt so they survive
+# restarts and are shared by every worker pointed at the same directory. The
+# key is derived from the sha256 of the raw file bytes (plus an optional salt
+# for parser settings), so the same resume uploaded for another posting, or
+# under another filename, is parsed only once. The total size on disk is
+# bounded and the least recently used entries are evicted first; recency is
+# kept in the file mtime so it carries over between processes.
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir, max_bytes=256 * 1024 * 1024, salt=''):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # digest -> size in bytes, oldest first
+        self._total_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.txt'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, name[:-4], st.st_size))
+        for _, digest, size in sorted(found):
+            self._entries[digest] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _path(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.txt")
+
+    # Cache key for a file whose content sha256 is already known (e.g. hashed during upload)
+    def key_for_digest(self, content_digest):
+        if not self.salt:
+            return content_digest
+        return hashlib.sha256(f"{self.salt}:{content_digest}".encode('utf-8')).hexdigest()
+
+    def key_for(self, file_path):
+        return self.key_for_digest(hash_file(file_path))
+
+    def get(self, digest):
+        path = self._path(digest)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+                if digest in self._entries:
+                    self._total_bytes -= self._entries.pop(digest)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+            else:
+                # Written by another worker since we loaded the index
+                size = len(text.encode('utf-8'))
+                self._entries[digest] = size
+                self._total_bytes += size
+                self._evict()
+        return text
+
+    def put(self, digest, text):
+        data = text.encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if digest in self._entries:
+                self._total_bytes -= self._entries.pop(digest)
+            self._entries[digest] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            digest, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(digest))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,132 @@
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from resume_parser import extract_text
+
+# Process pool for CPU-bound resume parsing.
+#
+# docx2txt, PyPDF2 and textract are pure Python or shell out and hold the GIL,
+# so a bulk upload is parsed across processes instead of on the request thread.
+# extract() yields results as each file finishes, letting the caller start
+# matching the first resumes while the rest are still being parsed.
+#
+# The pool is started lazily from screening threads while other threads are
+# running, so workers are spawned rather than forked: a forked child could
+# inherit a lock (logging's, say) that another thread was holding. A spawned
+# worker re-runs the launching script as __mp_main__ before it imports this
+# module, so scripts that use the pool build their services only when
+# __name__ != '__mp_main__' (see init_services() in app.py).
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionTimeout(BaseException):
+    # BaseException so the broad `except Exception` in the parser can't swallow it
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+
+# Runs in the worker process; the timeout is enforced there with SIGALRM so a
+# stuck file only costs its own slot and the worker stays usable. Returns
+# (text, error, per-page PDF timings).
+def _extract_worker(file_path, timeout):
+    timings = []
+    if not timeout or not hasattr(signal, 'setitimer'):
+        return extract_text(file_path, timings), None, timings
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_text(file_path, timings), None, timings
+    except ExtractionTimeout:
+        return "", f"timed out after {timeout}s", timings
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+# One line per PDF: pages parsed, characters kept, total and slowest page time
+def _log_pdf_timings(file_path, timings):
+    slowest = max(timings, key=lambda timing: timing[1])
+    logger.info("%s: %d pages, %d chars in %.1f ms (slowest page %d: %.1f ms)", file_path, len(timings),
+                sum(timing[2] for timing in timings), sum(timing[1] for timing in timings) * 1000,
+                slowest[0] + 1, slowest[1] * 1000)
+
+
+class ExtractionPool:
+    def __init__(self, workers=None, timeout=60, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cache = cache
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    # Yields (index, file_path, text) in completion order. Cached files are
+    # yielded first without touching the pool; files that fail or time out
+    # yield an empty string, matching extract_text()'s error behaviour.
+    # Pass the content sha256 of each file as `content_digests` if it is
+    # already known, so the file isn't read again just to hash it.
+    def extract(self, file_paths, content_digests=None):
+        pending = []
+        for index, file_path in enumerate(file_paths):
+            digest = None
+            if self.cache is not None:
+                if content_digests is not None:
+                    digest = self.cache.key_for_digest(content_digests[index])
+                else:
+                    digest = self.cache.key_for(file_path)
+                text = self.cache.get(digest)
+                if text is not None:
+                    yield index, file_path, text
+                    continue
+            pending.append((index, file_path, digest))
+
+        if not pending:
+            return
+
+        executor = self._get_executor()
+        futures = {executor.submit(_extract_worker, file_path, self.timeout): (index, file_path, digest)
+                   for index, file_path, digest in pending}
+        for future in as_completed(futures):
+            index, file_path, digest = futures[future]
+            try:
+                text, error, timings = future.result()
+            except BrokenProcessPool as e:
+                # A worker died (e.g. the parser segfaulted); start fresh next batch
+                self._reset_executor()
+                text, error, timings = "", str(e), []
+            except Exception as e:
+                text, error, timings = "", str(e), []
+            if timings:
+                _log_pdf_timings(file_path, timings)
+            if error:
+                logger.warning("Error processing file %s: %s", file_path, error)
+            elif text and self.cache is not None:
+                self.cache.put(digest, text)
+            yield index, file_path, text
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
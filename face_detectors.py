@@ -0,0 +1,109 @@
+import os
+import threading
+import cv2
+import numpy as np
+
+# Face detector backends behind one interface, loaded once and reused.
+#
+# Every backend takes a BGR frame (and optionally its grayscale version, if
+# the caller already has one) and returns a list of (x, y, w, h) boxes
+# clipped to the frame. None of the underlying detectors is documented as safe
+# to call from several threads at once, so get_detector() keeps one instance
+# per backend and options in each thread and hands the same one back on every
+# call: a worker pays for loading a model once, and per-frame cost is just the
+# detection.
+#
+#   detector = get_detector(os.getenv("FACE_DETECTOR", "haar"))
+#   for (x, y, w, h) in detector.detect(frame, gray): ...
+#
+# mtcnn is an optional dependency; the dnn backend needs the OpenCV res10 SSD
+# files (FACE_DNN_PROTOTXT and FACE_DNN_MODEL).
+
+HAAR_CASCADE = os.path.join(cv2.data.haarcascades, 'haarcascade_frontalface_default.xml')
+DNN_PROTOTXT = os.getenv("FACE_DNN_PROTOTXT", os.path.join('models', 'deploy.prototxt'))
+DNN_MODEL = os.getenv("FACE_DNN_MODEL", os.path.join('models', 'res10_300x300_ssd_iter_140000.caffemodel'))
+
+
+def _clip(box, frame):
+    height, width = frame.shape[:2]
+    x, y, w, h = (int(v) for v in box)
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, width), min(y + h, height)
+    return (x0, y0, x1 - x0, y1 - y0) if x1 > x0 and y1 > y0 else None
+
+
+class HaarDetector:
+    name = 'haar'
+
+    def __init__(self, scale_factor=1.3, min_neighbors=5, cascade=HAAR_CASCADE):
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.classifier = cv2.CascadeClassifier(cascade)
+        if self.classifier.empty():
+            raise ValueError(f"Could not load Haar cascade {cascade}")
+
+    def detect(self, frame, gray=None):
+        if gray is None:
+            gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = self.classifier.detectMultiScale(gray, scaleFactor=self.scale_factor, minNeighbors=self.min_neighbors)
+        return [tuple(int(v) for v in face) for face in faces]
+
+
+class MTCNNDetector:
+    name = 'mtcnn'
+
+    def __init__(self, min_confidence=0.9):
+        from mtcnn import MTCNN
+        self.min_confidence = min_confidence
+        self.detector = MTCNN()
+
+    def detect(self, frame, gray=None):
+        # MTCNN expects RGB
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        boxes = (_clip(face['box'], frame) for face in self.detector.detect_faces(rgb)
+                 if face['confidence'] >= self.min_confidence)
+        return [box for box in boxes if box]
+
+
+# OpenCV's ResNet-10 SSD face detector, run on a 300x300 copy of the frame
+class DNNDetector:
+    name = 'dnn'
+
+    def __init__(self, min_confidence=0.5, prototxt=DNN_PROTOTXT, model=DNN_MODEL, input_size=300):
+        self.min_confidence = min_confidence
+        self.input_size = input_size
+        self.net = cv2.dnn.readNetFromCaffe(prototxt, model)
+
+    def detect(self, frame, gray=None):
+        height, width = frame.shape[:2]
+        blob = cv2.dnn.blobFromImage(cv2.resize(frame, (self.input_size, self.input_size)), 1.0,
+                                     (self.input_size, self.input_size), (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        detections = self.net.forward()[0, 0]
+        detections = detections[detections[:, 2] >= self.min_confidence]
+        corners = detections[:, 3:7] * np.array([width, height, width, height])
+        boxes = (_clip((x0, y0, x1 - x0, y1 - y0), frame) for x0, y0, x1, y1 in corners)
+        return [box for box in boxes if box]
+
+
+DETECTORS = {
+    HaarDetector.name: HaarDetector,
+    MTCNNDetector.name: MTCNNDetector,
+    DNNDetector.name: DNNDetector,
+}
+
+_local = threading.local()
+
+
+# This thread's instance of backend `name` built with `options`, created on first use
+def get_detector(name='haar', **options):
+    if name not in DETECTORS:
+        raise ValueError(f"Unknown face detector {name!r}; expected one of {', '.join(sorted(DETECTORS))}")
+    instances = getattr(_local, 'instances', None)
+    if instances is None:
+        instances = _local.instances = {}
+    key = (name, tuple(sorted(options.items())))
+    detector = instances.get(key)
+    if detector is None:
+        detector = instances[key] = DETECTORS[name](**options)
+    return detector
@@ -0,0 +1,71 @@
+import cv2
+
+# Detect-then-track: full face detection every `detect_every` frames, cheap
+# template tracking in between.
+#
+# An interview is mostly one face that barely moves, so after a detection each
+# face's grayscale crop is kept as a template and found again in the next
+# frames with cv2.matchTemplate over a window around its last box. The
+# normalized correlation of the best match is the tracking confidence; the
+# detector runs again when any face drops below `min_confidence`, when the
+# last detection found nothing, or when `detect_every` frames have passed.
+# Templates are only replaced on detection, so tracking can't drift for long.
+#
+# FaceTracker has the same detect(frame, gray) as the backends in
+# face_detectors.py, so it can stand in for one. It keeps per-video state:
+# make one per video rather than sharing it.
+
+
+class FaceTracker:
+    def __init__(self, detector, detect_every=5, min_confidence=0.6, search_margin=0.5):
+        self.detector = detector
+        self.detect_every = max(int(detect_every), 1)
+        self.min_confidence = min_confidence
+        self.search_margin = search_margin
+        self.frames = 0
+        self.detections = 0
+        self._templates = []
+        self._since_detection = 0
+
+    # Fraction of frames that didn't need the detector
+    @property
+    def skip_ratio(self):
+        return 1 - self.detections / self.frames if self.frames else 0.0
+
+    def detect(self, frame, gray=None):
+        if gray is None:
+            gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.frames += 1
+        if self._templates and self._since_detection < self.detect_every:
+            boxes = self._track(gray)
+            if boxes is not None:
+                self._since_detection += 1
+                return boxes
+
+        self.detections += 1
+        self._since_detection = 1
+        boxes = self.detector.detect(frame, gray)
+        self._templates = [(box, gray[box[1]:box[1] + box[3], box[0]:box[0] + box[2]].copy())
+                           for box in boxes if box[2] >= 4 and box[3] >= 4]
+        return boxes
+
+    # New boxes for every tracked face, or None if any of them was lost
+    def _track(self, gray):
+        height, width = gray.shape[:2]
+        boxes = []
+        tracked = []
+        for (x, y, w, h), template in self._templates:
+            mx, my = int(w * self.search_margin), int(h * self.search_margin)
+            x0, y0 = max(x - mx, 0), max(y - my, 0)
+            x1, y1 = min(x + w + mx, width), min(y + h + my, height)
+            if x1 - x0 < w or y1 - y0 < h:
+                return None
+            scores = cv2.matchTemplate(gray[y0:y1, x0:x1], template, cv2.TM_CCOEFF_NORMED)
+            _, confidence, _, (dx, dy) = cv2.minMaxLoc(scores)
+            if confidence < self.min_confidence:
+                return None
+            box = (x0 + dx, y0 + dy, w, h)
+            boxes.append(box)
+            tracked.append((box, template))
+        self._templates = tracked
+        return boxes
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from werkzeug.utils import secure_filename
+
+# Upload ingestion for screening batches.
+#
+# Each upload is streamed to disk in chunks while its sha256 is computed, and
+# stored content-addressed as <upload_dir>/<sha256><ext>, so two resumes that
+# share a filename no longer overwrite each other and an identical resume is
+# stored once. Within a batch, exact duplicates point at the first copy
+# (`duplicate_of`) and are not parsed or scored again; across batches the
+# digest keys the extraction cache, and `seen_before` records that the bytes
+# were already on disk. A JSON manifest per batch records every entry so later
+# stages work from the manifest instead of re-reading or re-hashing files.
+#
+# Every entry also gets a `candidate_id` made of the batch id and its position
+# in the batch. Candidates are stored under that id, not the filename, so two
+# resumes called cv.pdf, or the same file screened again for another posting,
+# are separate candidates.
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadIngestor:
+    def __init__(self, upload_dir):
+        self.upload_dir = upload_dir
+        self.manifest_dir = os.path.join(upload_dir, 'manifests')
+        os.makedirs(self.manifest_dir, exist_ok=True)
+
+    # Streams one werkzeug FileStorage to disk; returns (sha256, path, size, seen_before)
+    def store(self, file, filename):
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.upload_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            # Parsers pick a format by extension, so keep it on the stored name
+            ext = os.path.splitext(filename)[1].lower()
+            path = os.path.join(self.upload_dir, f"{sha256}{ext}")
+            seen_before = os.path.exists(path)
+            if seen_before:
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return sha256, path, size, seen_before
+
+    # Stores every upload of a batch and writes its manifest
+    def ingest(self, files, batch_id):
+        entries = []
+        first_by_digest = {}
+        for file in files:
+            if not file:
+                continue
+            filename = secure_filename(file.filename)
+            sha256, path, size, seen_before = self.store(file, filename)
+            duplicate_of = first_by_digest.setdefault(sha256, len(entries))
+            entries.append({
+                'candidate_id': f"{batch_id}-{len(entries)}",
+                'filename': filename,
+                'sha256': sha256,
+                'path': path,
+                'size': size,
+                'seen_before': seen_before,
+                'duplicate_of': duplicate_of if duplicate_of != len(entries) else None,
+            })
+        manifest = {'batch_id': batch_id, 'created_at': time.time(), 'entries': entries}
+        manifest_path = os.path.join(self.manifest_dir, f"{batch_id}.json")
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        return manifest
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# On-disk cache for completion responses, shared by the screening app and the
+# answer-checking scripts.
+#
+# Entries are keyed by model, whitespace-normalised prompt and the sampling
+# parameters, expire after `ttl` seconds and are evicted least recently used
+# once there are more than `max_entries`. SQLite in WAL mode lets several
+# worker processes share one cache file; each thread gets its own connection.
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Evict at most every this many writes rather than counting rows on each one
+EVICT_EVERY = 100
+
+
+def normalize_prompt(prompt):
+    return WHITESPACE_RE.sub(' ', prompt).strip()
+
+
+class LLMCache:
+    def __init__(self, path, ttl=7 * 24 * 3600, max_entries=50000, bypass=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self._writes = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS completions_accessed_at ON completions (accessed_at)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def key(self, model, prompt, **params):
+        payload = json.dumps([model, normalize_prompt(prompt), params], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, model, prompt, **params):
+        key = self.key(model, prompt, **params)
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute("SELECT response, created_at FROM completions WHERE key = ?", (key,)).fetchone()
+        if row is not None and self.ttl and now - row[1] > self.ttl:
+            conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            conn.commit()
+            row = None
+        if row is None:
+            return None
+        conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+        conn.commit()
+        return row[0]
+
+    def set(self, model, prompt, response, **params):
+        key = self.key(model, prompt, **params)
+        conn = self._conn()
+        now = time.time()
+        conn.execute("INSERT OR REPLACE INTO completions (key, model, response, created_at, accessed_at) "
+                     "VALUES (?, ?, ?, ?, ?)", (key, model, response, now, now))
+        conn.commit()
+        with self._lock:
+            self._writes += 1
+            evict = (self._writes - 1) % EVICT_EVERY == 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        conn = self._conn()
+        if self.ttl:
+            conn.execute("DELETE FROM completions WHERE created_at < ?", (time.time() - self.ttl,))
+        conn.execute("""
+            DELETE FROM completions WHERE key IN (
+                SELECT key FROM completions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+        conn.commit()
+
+    # Returns the cached response for this prompt, or calls `call()` and stores
+    # its result. `bypass` (or the cache-wide flag) skips the lookup but still
+    # refreshes the stored entry.
+    def cached(self, model, prompt, call, bypass=False, **params):
+        if not (bypass or self.bypass):
+            response = self.get(model, prompt, **params)
+            if response is not None:
+                return response
+        response = call()
+        self.set(model, prompt, response, **params)
+        return response
+
+
+# Cache configured from LLM_CACHE_* environment variables, so every entry point shares one file
+def cache_from_env():
+    return LLMCache(
+        os.getenv("LLM_CACHE_PATH", os.path.join('cache', 'llm.sqlite3')),
+        ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000")),
+        bypass=os.getenv("LLM_CACHE_BYPASS", "0") == "1",
+    )
@@ -0,0 +1,128 @@
+import random
+import threading
+import time
+
+# Rate-limit-aware dispatcher for completion calls.
+#
+# Calls from any thread share a bounded number of in-flight slots, and each
+# one is admitted through request-per-minute and token-per-minute buckets
+# sized to the deployment's quota. Throttling responses (HTTP 429) are retried with
+# full-jitter exponential backoff, and a Retry-After hint pauses every caller
+# rather than just the one that was throttled.
+# Point AZURE_OPENAI_ENDPOINT at mock_completions_server.py to exercise this
+# locally with configurable latency and 429 rate.
+
+
+# Rough prompt size for budgeting; completions are billed on prompt + max_tokens
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+
+def _status_code(exc):
+    for attr in ('status_code', 'http_status', 'status'):
+        code = getattr(exc, attr, None)
+        if isinstance(code, int):
+            return code
+    response = getattr(exc, 'response', None)
+    code = getattr(response, 'status_code', None)
+    return code if isinstance(code, int) else None
+
+
+def is_throttled(exc):
+    return _status_code(exc) == 429 or type(exc).__name__ == 'RateLimitError'
+
+
+def retry_after(exc):
+    headers = getattr(exc, 'headers', None) or getattr(getattr(exc, 'response', None), 'headers', None) or {}
+    try:
+        value = headers.get('Retry-After') or headers.get('retry-after')
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.available = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Seconds until `amount` is available (0 if it already is)
+    def wait_time(self, amount):
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    # Blocks until one request and `tokens` tokens fit in the budgets
+    def acquire(self, tokens=0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self.paused_until - now
+                if self.tokens is not None:
+                    # A prompt bigger than the whole budget would otherwise wait forever
+                    tokens = min(tokens, self.tokens.capacity)
+                for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                    if bucket is not None:
+                        bucket.refill(now)
+                        wait = max(wait, bucket.wait_time(amount))
+                if wait <= 0:
+                    if self.requests is not None:
+                        self.requests.available -= 1
+                    if self.tokens is not None:
+                        self.tokens.available -= tokens
+                    return
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class LLMDispatcher:
+    def __init__(self, max_concurrency=8, requests_per_minute=0, tokens_per_minute=0,
+                 max_retries=5, base_delay=1.0, max_delay=30.0):
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Caps in-flight calls across every thread that goes through call()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    # Makes one completion call on the current thread: waits for budget, then
+    # retries throttled attempts. `tokens` is the estimated prompt + completion
+    # size. Callers do their cache lookup first so hits never consume quota.
+    # `on_retry(attempt, exc)` is called before each retry, e.g. for metrics.
+    def call(self, fn, tokens=0, on_retry=None):
+        attempt = 0
+        while True:
+            self.limiter.acquire(tokens)
+            try:
+                with self._slots:
+                    return fn()
+            except Exception as e:
+                if not is_throttled(e) or attempt >= self.max_retries:
+                    raise
+                # Full jitter: sleep a random amount up to the exponential cap
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                hint = retry_after(e)
+                if hint:
+                    self.limiter.pause(hint)
+                    delay = max(delay, hint)
+                attempt += 1
+                if on_retry is not None:
+                    on_retry(attempt, e)
+                time.sleep(delay)
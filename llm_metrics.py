@@ -0,0 +1,149 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Instrumentation for completion calls, exposed in Prometheus text format.
+#
+# Every completion goes through LLMMetrics.observe(stage, model), which records
+# wall time (including cache lookup, rate-limit waits and retries), prompt and
+# completion tokens, retries and whether the response came from the cache.
+# Histograms and counters are kept in memory per process and rendered by
+# render() for a /metrics endpoint; with several worker processes, scrape
+# each one (or aggregate in Prometheus).
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, help, label_names, buckets):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.setdefault(label_values, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            for bound, count in zip(self.buckets, values):
+                labels = _format_labels(self.label_names, label_values, [('le', _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.label_names, label_values, [('le', '+Inf')])
+            lines.append(f"{self.name}_bucket{labels} {values[-1]}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{labels} {values[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, label_names):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+# What happened during one observed call; the completion wrapper fills it in
+class CallRecord:
+    def __init__(self):
+        self.cache_hit = True
+        self.retries = 0
+        self.prompt_tokens = None
+        self.completion_tokens = None
+
+    # Called when the cache misses and the API is actually called
+    def miss(self):
+        self.cache_hit = False
+
+    # Matches LLMDispatcher.call's on_retry(attempt, exc) hook
+    def retry(self, attempt, exc):
+        self.retries += 1
+
+    def usage(self, prompt_tokens, completion_tokens):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class LLMMetrics:
+    def __init__(self):
+        labels = ('stage', 'model')
+        self.duration = Histogram('llm_call_duration_seconds',
+                                  'Wall time of a completion call, including cache lookup, rate limiting and retries.',
+                                  labels + ('cache',), DURATION_BUCKETS)
+        self.prompt_tokens = Histogram('llm_prompt_tokens', 'Prompt tokens sent per completion request.',
+                                       labels, TOKEN_BUCKETS)
+        self.completion_tokens = Histogram('llm_completion_tokens', 'Completion tokens received per request.',
+                                           labels, TOKEN_BUCKETS)
+        self.calls = Counter('llm_calls_total', 'Completion calls by outcome (hit, miss or error).',
+                             labels + ('outcome',))
+        self.retries = Counter('llm_retries_total', 'Throttled completion attempts that were retried.', labels)
+
+    # Times the body and records the CallRecord it yields
+    @contextmanager
+    def observe(self, stage, model):
+        record = CallRecord()
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            yield record
+            outcome = 'hit' if record.cache_hit else 'miss'
+        finally:
+            elapsed = time.perf_counter() - started
+            self.duration.observe(elapsed, stage, model, 'hit' if record.cache_hit else 'miss')
+            self.calls.inc(1, stage, model, outcome)
+            if record.retries:
+                self.retries.inc(record.retries, stage, model)
+            # Tokens are only spent on the API, so cache hits don't count towards them
+            if not record.cache_hit:
+                if record.prompt_tokens is not None:
+                    self.prompt_tokens.observe(record.prompt_tokens, stage, model)
+                if record.completion_tokens is not None:
+                    self.completion_tokens.observe(record.completion_tokens, stage, model)
+
+    def render(self):
+        lines = []
+        for metric in (self.duration, self.prompt_tokens, self.completion_tokens, self.calls, self.retries):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
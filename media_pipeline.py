@@ -0,0 +1,186 @@
+import os
+import subprocess
+import tempfile
+import threading
+import numpy as np
+
+# One decode pass per interview video, feeding both the frame stages (faces,
+# emotions) and speech recognition.
+#
+# A single ffmpeg process demuxes and decodes the file once and writes two
+# outputs at the same time: the video, already thinned to the sampling policy
+# (fps filter plus a downscale), as a stream of BMP images on stdout, and the
+# first audio track as 16 kHz mono signed 16-bit PCM to a temporary file. BMP
+# carries its own size and is BGR like OpenCV, so frames are read straight
+# into numpy arrays without probing the file first.
+#
+#   with MediaDecode(path, FrameSampling(fps=1)) as media:
+#       emotions = analyze_frames(frame for _, frame in media.frames())
+#       text = asr({'raw': media.audio(), 'sampling_rate': ASR_SAMPLE_RATE})
+
+ASR_SAMPLE_RATE = 16000
+BMP_HEADER_SIZE = 14
+DRAIN_CHUNK_SIZE = 1 << 16
+NO_AUDIO_ERRORS = ('matches no streams', 'does not contain any stream')
+
+
+# Which frames the frame stages see: `fps` frames per second of video, scaled
+# down to at most `max_width` pixels wide (None keeps the original size)
+class FrameSampling:
+    def __init__(self, fps=1.0, max_width=640):
+        self.fps = fps
+        self.max_width = max_width
+
+    def filters(self):
+        parts = [f"fps={self.fps}"]
+        if self.max_width:
+            parts.append(f"scale='min({self.max_width},iw)':-2")
+        return ','.join(parts)
+
+    def __repr__(self):
+        return f"FrameSampling(fps={self.fps!r}, max_width={self.max_width!r})"
+
+
+DEFAULT_SAMPLING = FrameSampling()
+
+
+# The ffmpeg moviepy uses: $FFMPEG_BINARY, the imageio-ffmpeg binary, or ffmpeg on PATH
+def ffmpeg_binary():
+    binary = os.getenv("FFMPEG_BINARY")
+    if binary:
+        return binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except ImportError:
+        return 'ffmpeg'
+
+
+def _read_exact(stream, size):
+    data = bytearray()
+    while len(data) < size:
+        block = stream.read(size - len(data))
+        if not block:
+            break
+        data += block
+    return bytes(data)
+
+
+# Decodes a 24-bit BMP into an (height, width, 3) BGR array
+def _bmp_to_array(data):
+    offset = int.from_bytes(data[10:14], 'little')
+    width = int.from_bytes(data[18:22], 'little', signed=True)
+    height = int.from_bytes(data[22:26], 'little', signed=True)
+    stride = (width * 3 + 3) & ~3
+    rows = np.frombuffer(data, dtype=np.uint8, count=stride * abs(height), offset=offset)
+    frame = rows.reshape(abs(height), stride)[:, :width * 3].reshape(abs(height), width, 3)
+    # Positive heights are stored bottom-up
+    return np.ascontiguousarray(frame[::-1] if height > 0 else frame)
+
+
+class MediaDecode:
+    def __init__(self, video_path, sampling=None, audio=True, sample_rate=ASR_SAMPLE_RATE):
+        self.video_path = video_path
+        self.sampling = sampling or DEFAULT_SAMPLING
+        self.sample_rate = sample_rate
+        self.has_audio = audio
+        self._pcm = None
+        self._audio_path = None
+        self._process = None
+        self._started = False
+        self._finished = False
+        self._start()
+
+    def _start(self):
+        cmd = [ffmpeg_binary(), '-nostdin', '-v', 'error', '-i', self.video_path,
+               '-map', '0:v:0', '-vf', self.sampling.filters(),
+               '-pix_fmt', 'bgr24', '-c:v', 'bmp', '-f', 'image2pipe', 'pipe:1']
+        if self.has_audio:
+            fd, self._audio_path = tempfile.mkstemp(suffix='.pcm')
+            os.close(fd)
+            cmd += ['-map', '0:a:0', '-ac', '1', '-ar', str(self.sample_rate), '-f', 's16le', '-y', self._audio_path]
+        self._process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # Drain stderr on the side so a chatty ffmpeg can never block on it
+        self._stderr = []
+        self._stderr_thread = threading.Thread(target=lambda: self._stderr.append(self._process.stderr.read()),
+                                               daemon=True)
+        self._stderr_thread.start()
+
+    def _wait(self):
+        returncode = self._process.wait()
+        self._stderr_thread.join()
+        return returncode, b''.join(self._stderr).decode('utf-8', 'replace').strip()
+
+    # Yields (timestamp in seconds, BGR frame) for every sampled frame. Can be
+    # iterated once; a video without an audio track is decoded video-only.
+    def frames(self):
+        if self._started:
+            raise RuntimeError("MediaDecode.frames() can only be iterated once")
+        self._started = True
+        index = 0
+        while True:
+            header = _read_exact(self._process.stdout, BMP_HEADER_SIZE)
+            if len(header) < BMP_HEADER_SIZE:
+                break
+            size = int.from_bytes(header[2:6], 'little')
+            body = _read_exact(self._process.stdout, size - BMP_HEADER_SIZE)
+            if len(body) < size - BMP_HEADER_SIZE:
+                break
+            yield index / self.sampling.fps, _bmp_to_array(header + body)
+            index += 1
+
+        returncode, errors = self._wait()
+        if returncode and index == 0 and self.has_audio and any(e in errors for e in NO_AUDIO_ERRORS):
+            self._discard_audio()
+            self.has_audio = False
+            self._started = False
+            self._start()
+            yield from self.frames()
+            return
+        self._finished = True
+        if returncode:
+            raise RuntimeError(f"ffmpeg failed on {self.video_path}: {errors}")
+
+    # Mono PCM as float32 in [-1, 1] at sample_rate; empty if the video has no
+    # audio. Finishes the decode first, skipping any frames not yet read.
+    def audio(self):
+        if self._pcm is None:
+            if not self._started:
+                for _ in self.frames():
+                    pass
+            elif not self._finished:
+                # Drop the unread frames a chunk at a time so they are never all in memory
+                while self._process.stdout.read(DRAIN_CHUNK_SIZE):
+                    pass
+                returncode, errors = self._wait()
+                self._finished = True
+                if returncode:
+                    raise RuntimeError(f"ffmpeg failed on {self.video_path}: {errors}")
+            if self.has_audio:
+                with open(self._audio_path, 'rb') as f:
+                    self._pcm = np.frombuffer(f.read(), dtype='<i2').astype(np.float32) / 32768.0
+                self._discard_audio()
+            else:
+                self._pcm = np.zeros(0, dtype=np.float32)
+        return self._pcm
+
+    def _discard_audio(self):
+        if self._audio_path:
+            try:
+                os.remove(self._audio_path)
+            except FileNotFoundError:
+                pass
+            self._audio_path = None
+
+    def close(self):
+        if self._process and self._process.poll() is None:
+            self._process.kill()
+            self._process.stdout.close()
+            self._wait()
+        self._discard_audio()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
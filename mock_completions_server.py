@@ -0,0 +1,135 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for the completions endpoint, for exercising the dispatcher,
+# caches and benchmarks without an Azure OpenAI deployment. Any POST to a path
+# ending in /completions gets a canned completion after `latency` seconds
+# (plus up to `jitter`); a `throttle_rate` fraction of requests get a 429 with
+# a Retry-After header instead.
+#
+#   python mock_completions_server.py --port 8089 --latency 0.5 --throttle-rate 0.1
+#   AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8089 python app.py
+
+QUESTIONS = '\n'.join(f"{i}. Describe a project where you used the skills listed on your resume." for i in range(1, 11))
+
+
+# Answer checks ask for a JSON array with one verdict per "Answer N:" block
+def canned_verdicts(prompt):
+    fields = [field for field in ('plagiarized', 'ai_generated') if f'"{field}"' in prompt]
+    count = len(re.findall(r"^Answer \d+:", prompt, re.MULTILINE))
+    return json.dumps([dict([('answer', i)] + [(field, False) for field in fields]) for i in range(1, count + 1)])
+
+
+def canned_completion(prompt):
+    if 'json array' in prompt.lower():
+        return canned_verdicts(prompt)
+    if 'questions' in prompt.lower():
+        return QUESTIONS
+    if 'plagiarized' in prompt.lower() or 'generated by ai' in prompt.lower():
+        return 'False'
+    return f"{random.randint(40, 95)}%"
+
+
+class MockCompletionsHandler(BaseHTTPRequestHandler):
+    server_version = 'MockCompletions/1.0'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            body = {}
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        if not self.path.split('?')[0].endswith('/completions'):
+            self._send(404, {'error': {'code': 'NotFound', 'message': self.path}})
+            return
+
+        time.sleep(server.latency + random.uniform(0, server.jitter))
+        if random.random() < server.throttle_rate:
+            with server.lock:
+                server.throttled += 1
+            self._send(429, {'error': {'code': '429', 'message': 'Rate limit exceeded'}},
+                       {'Retry-After': str(server.retry_after)})
+            return
+
+        prompt = body.get('prompt') or ''
+        if isinstance(prompt, list):
+            prompt = '\n'.join(prompt)
+        text = canned_completion(prompt)
+        prompt_tokens = len(prompt) // 4 + 1
+        completion_tokens = len(text) // 4 + 1
+        self._send(200, {
+            'id': f"cmpl-{uuid.uuid4().hex}",
+            'object': 'text_completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'mock'),
+            'choices': [{'text': text, 'index': 0, 'logprobs': None, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens},
+        })
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class MockCompletionsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, throttle_rate=0.0,
+                 retry_after=1, verbose=False):
+        super().__init__((host, port), MockCompletionsHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.verbose = verbose
+        self.requests = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # Serves on a daemon thread; returns the server so callers can read .url and shut it down
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local stand-in for the completions endpoint')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.5, help='seconds before each response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random latency, in seconds')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server = MockCompletionsServer(args.host, args.port, args.latency, args.jitter, args.throttle_rate,
+                                   args.retry_after, args.verbose)
+    print(f"Mock completions endpoint listening on {server.url}")
+    server.serve_forever()
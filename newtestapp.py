@@ -1,6 +1,6 @@
-from flask import Flask, render_template, request, redirect, url_for
-import base64
+from flask import Flask, render_template, request, redirect, url_for, jsonify
 import os
+from chunked_upload import UploadStore, UploadError, UnknownUpload, OffsetMismatch, UploadTooLarge
 
 app = Flask(__name__)
 
@@ -8,28 +8,67 @@ app = Flask(__name__)
 if not os.path.exists('videos'):
     os.makedirs('videos')
 
+# Answer videos are uploaded in chunks while they are being recorded and
+# only moved into videos/ once submit_test() has checked their SHA-256
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join('videos', 'uploads'))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(500 * 1024 * 1024)))
+uploads = UploadStore(UPLOAD_DIR, max_bytes=UPLOAD_MAX_BYTES)
+
 @app.route('/')
 def index():
-    return render_template('test.html')
+    return render_template('newtest.html')
+
+def upload_error(error):
+    if isinstance(error, UnknownUpload):
+        return jsonify({'error': str(error)}), 404
+    if isinstance(error, OffsetMismatch):
+        return jsonify({'error': str(error), 'offset': error.offset}), 409
+    if isinstance(error, UploadTooLarge):
+        return jsonify({'error': str(error)}), 413
+    return jsonify({'error': str(error)}), 400
+
+@app.route('/uploads', methods=['POST'])
+def create_upload():
+    return jsonify({'upload_id': uploads.create(), 'offset': 0}), 201
+
+# Current offset, for resuming after a dropped connection
+@app.route('/uploads/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    try:
+        offset = uploads.offset(upload_id)
+    except UploadError as e:
+        return upload_error(e)
+    return jsonify({'upload_id': upload_id, 'offset': offset}), 200, {'Upload-Offset': str(offset)}
+
+# Appends the raw request body at the Upload-Offset header
+@app.route('/uploads/<upload_id>', methods=['PATCH'])
+def upload_chunk(upload_id):
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+    except ValueError:
+        return jsonify({'error': 'Upload-Offset header is required'}), 400
+    try:
+        offset = uploads.write_chunk(upload_id, offset, request.stream)
+    except UploadError as e:
+        return upload_error(e)
+    return jsonify({'upload_id': upload_id, 'offset': offset}), 200, {'Upload-Offset': str(offset)}
 
 @app.route('/submit_test', methods=['POST'])
 def submit_test():
-    video_responses = {}
+    errors = []
     for i in range(1, 6):
-        video_data = request.form.get(f'video{i}')
-        if video_data:
-            video_responses[f'question_{i}'] = video_data
-
-    # Save videos or process them further
-    for question, video_data in video_responses.items():
-        # Extract base64 part from data URL
-        video_base64 = video_data.split(",")[1]
-        video_bytes = base64.b64decode(video_base64)
-        video_path = os.path.join('videos', f'{question}.webm')
-
-        with open(video_path, 'wb') as f:
-            f.write(video_bytes)
+        upload_id = request.form.get(f'video{i}')
+        if not upload_id:
+            continue
+        video_path = os.path.join('videos', f'question_{i}.webm')
+        try:
+            uploads.finish(upload_id, request.form.get(f'video{i}_sha256'), video_path)
+        except UploadError as e:
+            print(f"Error saving video for question {i}: {e}")
+            errors.append(f"Question {i}: {e}")
 
+    if errors:
+        return "Some answers could not be saved, please record them again.<br>" + "<br>".join(errors), 400
     return redirect(url_for('index'))
 
 if __name__ == '__main__':
@@ -0,0 +1,138 @@
+import contextvars
+import logging
+import queue
+import threading
+
+# Streaming stage pipeline.
+#
+# Each stage runs on its own worker threads and stages are joined by bounded
+# queues, so an item moves on as soon as its stage finishes with it, and a
+# slow stage applies backpressure instead of letting work pile up in memory.
+# End-to-end time for a batch approaches that of the slowest stage rather than
+# the sum of all of them.
+#
+# A stage function takes an item and returns the item to pass on, or None to
+# drop it. Stages with batch_size > 1 get a list of whatever items are already
+# waiting (up to batch_size) and return a list, which suits batched writes.
+# If a stage raises, on_error(item, exc) is called and the item is dropped.
+# Worker threads run in a copy of the caller's context, so context variables
+# such as the current trace (see tracing.py) carry over into stages.
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+class Stage:
+    def __init__(self, name, fn, workers=1, batch_size=1):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.batch_size = batch_size
+
+
+class Pipeline:
+    def __init__(self, stages, maxsize=32, on_error=None):
+        self.stages = stages
+        self.maxsize = maxsize
+        self.on_error = on_error
+
+    def _error(self, stage, item, exc):
+        if self.on_error is None:
+            logger.warning("Pipeline stage %s failed: %s", stage.name, exc)
+        else:
+            self.on_error(item, exc)
+
+    def _take_batch(self, stage, inbox):
+        first = inbox.get()
+        if first is _END:
+            return None, True
+        batch = [first]
+        while len(batch) < stage.batch_size:
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _work(self, stage, inbox, outbox, finished):
+        done = False
+        while not done:
+            if stage.batch_size > 1:
+                batch, done = self._take_batch(stage, inbox)
+                if batch is None:
+                    break
+                try:
+                    results = stage.fn(batch) or []
+                except Exception as e:
+                    for item in batch:
+                        self._error(stage, item, e)
+                    continue
+            else:
+                item = inbox.get()
+                if item is _END:
+                    break
+                try:
+                    result = stage.fn(item)
+                except Exception as e:
+                    self._error(stage, item, e)
+                    continue
+                results = [] if result is None else [result]
+            for result in results:
+                outbox.put(result)
+        finished()
+
+    # Feeds `source` through every stage on background threads and yields
+    # what comes out of the last one, in completion order.
+    def run(self, source):
+        queues = [queue.Queue(self.maxsize) for _ in range(len(self.stages) + 1)]
+        source_error = []
+
+        def feed():
+            try:
+                for item in source:
+                    queues[0].put(item)
+            except Exception as e:
+                source_error.append(e)
+            finally:
+                for _ in range(self.stages[0].workers if self.stages else 1):
+                    queues[0].put(_END)
+
+        # A Context can only be entered by one thread at a time, so each thread gets its own copy
+        def in_context(target, *args, **kwargs):
+            return threading.Thread(target=contextvars.copy_context().run, args=(target, *args), **kwargs)
+
+        threads = [in_context(feed, daemon=True)]
+        for position, stage in enumerate(self.stages):
+            inbox, outbox = queues[position], queues[position + 1]
+            following = self.stages[position + 1].workers if position + 1 < len(self.stages) else 1
+            remaining = [stage.workers]
+            lock = threading.Lock()
+
+            # The last worker of a stage to finish tells the next stage to stop
+            def finished(remaining=remaining, lock=lock, outbox=outbox, following=following):
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    for _ in range(following):
+                        outbox.put(_END)
+
+            for _ in range(stage.workers):
+                threads.append(in_context(self._work, stage, inbox, outbox, finished,
+                                          name=f"pipeline-{stage.name}", daemon=True))
+        for thread in threads:
+            thread.start()
+
+        while True:
+            item = queues[-1].get()
+            if item is _END:
+                break
+            yield item
+        for thread in threads:
+            thread.join()
+        if source_error:
+            raise source_error[0]
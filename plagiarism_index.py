@@ -0,0 +1,134 @@
+import re
+import threading
+import zlib
+import numpy as np
+
+# MinHash / LSH index for near-duplicate answers across candidates.
+#
+# Answers are split into word shingles, each shingle is hashed to 32 bits and
+# every answer gets a MinHash signature of `num_perm` values. Signatures live
+# in one growing uint32 array (num_perm * 4 bytes per answer, so 50k answers
+# take ~25 MB), and each signature is split into `bands` bands that are
+# bucketed in per-band dicts. A lookup only compares against answers sharing
+# at least one band bucket, so it costs far less than a scan of every answer,
+# and the Jaccard similarity is estimated from the fraction of matching
+# signature values. With 128 permutations in 32 bands of 4 rows, pairs above
+# roughly 0.45 Jaccard are very likely to collide in at least one band.
+
+MERSENNE_PRIME = (1 << 31) - 1
+WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text, size=3):
+    words = WORD_RE.findall((text or '').lower())
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHashLSH:
+    def __init__(self, num_perm=128, bands=32, shingle_size=3, seed=1, capacity=1024):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # Universal hashes h(x) = (a * x + b) mod p; a*x stays below 2**62 so uint64 can't overflow
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._signatures = np.empty((capacity, num_perm), dtype=np.uint32)
+        self._keys = []
+        self._ids = {}  # key -> row in _signatures
+        self._buckets = [dict() for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def signature(self, text):
+        tokens = shingles(text, self.shingle_size)
+        if not tokens:
+            return None
+        hashes = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in tokens),
+                             dtype=np.uint64, count=len(tokens)) % MERSENNE_PRIME
+        # (shingles x num_perm) permuted hashes, reduced to the minimum per permutation
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [hash(signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _candidates(self, band_keys):
+        found = set()
+        for bucket, band_key in zip(self._buckets, band_keys):
+            rows = bucket.get(band_key)
+            if rows is None:
+                continue
+            if isinstance(rows, int):
+                found.add(rows)
+            else:
+                found.update(rows)
+        return found
+
+    def _score(self, signature, band_keys, threshold, exclude):
+        rows = np.fromiter(self._candidates(band_keys), dtype=np.int64)
+        if len(rows) == 0:
+            return []
+        similarity = (self._signatures[rows] == signature).mean(axis=1)
+        matches = []
+        for row, score in zip(rows, similarity):
+            key = self._keys[row]
+            if score >= threshold and (exclude is None or not exclude(key)):
+                matches.append((key, float(score)))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def _insert(self, key, signature, band_keys):
+        row = len(self._keys)
+        if row == len(self._signatures):
+            grown = np.empty((len(self._signatures) * 2, self.num_perm), dtype=np.uint32)
+            grown[:row] = self._signatures
+            self._signatures = grown
+        self._signatures[row] = signature
+        self._keys.append(key)
+        self._ids[key] = row
+        # A bucket holds a bare row id until it gets a second member, which saves memory
+        for bucket, band_key in zip(self._buckets, band_keys):
+            rows = bucket.get(band_key)
+            if rows is None:
+                bucket[band_key] = row
+            elif isinstance(rows, int):
+                bucket[band_key] = [rows, row]
+            else:
+                rows.append(row)
+
+    # Indexes the answer under `key` without looking for matches
+    def add(self, key, text):
+        signature = self.signature(text)
+        if signature is None:
+            return
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            if key not in self._ids:
+                self._insert(key, signature, band_keys)
+
+    # Indexes the answer under `key` and returns [(key, estimated_jaccard)] for
+    # other indexed answers at or above `threshold`, most similar first.
+    # `exclude(key)` can filter out e.g. the same candidate.
+    def add_and_query(self, key, text, threshold=0.5, exclude=None):
+        signature = self.signature(text)
+        if signature is None:
+            return []
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            if key in self._ids:
+                return self._score(signature, band_keys, threshold,
+                                   lambda other: other == key or (exclude is not None and exclude(other)))
+            matches = self._score(signature, band_keys, threshold, exclude)
+            self._insert(key, signature, band_keys)
+            return matches
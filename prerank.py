@@ -0,0 +1,88 @@
+import math
+import re
+import zlib
+from collections import Counter
+import numpy as np
+
+# Local first-stage ranking of resumes against a job description.
+#
+# Every resume in a batch is scored with a hashed TF-IDF vector and cosine
+# similarity in a single NumPy pass, so only a shortlist has to go through the
+# LLM. Documents are kept sparse (a flat array of hashed feature indices plus a
+# document id per entry) and the whole batch is reduced with np.bincount, which
+# stays cheap for hundreds of resumes without materialising a dense matrix.
+
+N_FEATURES = 2 ** 20
+
+# Keeps tokens such as c++, c#, node.js and .net intact
+TOKEN_RE = re.compile(r"[a-z0-9.+#]*[a-z0-9+#]")
+
+
+def tokenize(text):
+    words = TOKEN_RE.findall(text.lower())
+    # Bigrams catch phrases like "machine learning" or "project management"
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _hash_features(tokens, n_features):
+    return np.fromiter((zlib.crc32(token.encode('utf-8')) for token in tokens),
+                       dtype=np.uint32, count=len(tokens)).astype(np.int64) % n_features
+
+
+# Returns (doc_ids, feature_indices, counts) with one entry per distinct feature per document
+def _vectorize(texts, n_features):
+    doc_ids, indices, counts = [], [], []
+    for doc_id, text in enumerate(texts):
+        token_counts = Counter(tokenize(text or ''))
+        features = _hash_features(list(token_counts), n_features)
+        # Distinct tokens can collide on a feature; merge their counts
+        unique, inverse = np.unique(features, return_inverse=True)
+        count = np.bincount(inverse, weights=np.fromiter(token_counts.values(), dtype=np.float64, count=len(token_counts)))
+        doc_ids.append(np.full(len(unique), doc_id, dtype=np.int64))
+        indices.append(unique)
+        counts.append(count)
+    if not indices:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0)
+    return np.concatenate(doc_ids), np.concatenate(indices), np.concatenate(counts)
+
+
+# Cosine similarity between the job description and each resume, in input order
+def score(job_description, resume_texts, n_features=N_FEATURES):
+    n = len(resume_texts)
+    if n == 0:
+        return np.zeros(0)
+    # The job description is document n so it shares the batch's IDF
+    doc_ids, indices, counts = _vectorize(list(resume_texts) + [job_description], n_features)
+
+    df = np.bincount(indices, minlength=n_features)
+    idf = np.log((1 + n + 1) / (1 + df)) + 1
+    weights = (1 + np.log(counts)) * idf[indices]
+
+    is_jd = doc_ids == n
+    jd_vector = np.zeros(n_features)
+    jd_vector[indices[is_jd]] = weights[is_jd]
+    jd_norm = np.linalg.norm(jd_vector)
+
+    resume_ids = doc_ids[~is_jd]
+    resume_weights = weights[~is_jd]
+    dots = np.bincount(resume_ids, resume_weights * jd_vector[indices[~is_jd]], minlength=n)
+    norms = np.sqrt(np.bincount(resume_ids, resume_weights ** 2, minlength=n))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = dots / (norms * jd_norm)
+    return np.nan_to_num(scores)
+
+
+# Indices (in input order) of the resumes worth sending to the LLM: the top
+# `ratio` of the batch, never fewer than `min_count`, plus anything scoring
+# at least `min_score` regardless of rank.
+def shortlist(scores, ratio=1.0, min_count=0, min_score=None):
+    n = len(scores)
+    if n == 0:
+        return []
+    k = min(n, max(min_count, math.ceil(ratio * n)))
+    keep = np.zeros(n, dtype=bool)
+    keep[np.argsort(-scores, kind='stable')[:k]] = True
+    if min_score is not None:
+        keep |= scores >= min_score
+    return np.flatnonzero(keep).tolist()
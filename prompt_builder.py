@@ -0,0 +1,178 @@
+import logging
+import re
+import textwrap
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Token-budgeted prompt building for the resume / job description prompts.
+#
+# Extracted resume text is full of layout noise (indentation, runs of blank
+# lines, page headers repeated on every page), and long CVs can overflow the
+# model's context. Text is compacted first; if the prompt is still over
+# budget, resume sections are kept in priority order (skills and experience
+# first) and the last one that fits is truncated. Token counts come from
+# tiktoken when it is installed and a word/punctuation estimate otherwise.
+
+logger = logging.getLogger(__name__)
+
+TOKENIZER_ENCODING = "p50k_base"  # text-davinci-002/003
+
+# Share of the budget the job description may use before it is truncated too
+JOB_DESCRIPTION_SHARE = 0.35
+
+# Lower number = kept first when the resume has to be cut down
+SECTION_PRIORITY = {
+    'skills': 0,
+    'experience': 1,
+    'projects': 2,
+    'summary': 3,
+    'certifications': 4,
+    'education': 5,
+    'other': 6,
+}
+
+SECTION_HEADINGS = {
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'core competencies', 'competencies',
+               'technologies', 'tech stack', 'tools'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment history',
+                   'work history', 'career history', 'employment'),
+    'projects': ('projects', 'key projects', 'personal projects', 'portfolio'),
+    'summary': ('summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'courses', 'training'),
+    'education': ('education', 'academic background', 'qualifications', 'academics'),
+}
+HEADING_TO_SECTION = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+
+APPROX_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+HEADING_RE = re.compile(r"^[\W_]*([A-Za-z][A-Za-z &/]{2,40}?)[\s:\-_]*$")
+SPACES_RE = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+    return _encoding
+
+
+def count_tokens(text):
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Roughly one token per word or punctuation mark; long words split further
+    return sum(1 + len(token) // 8 for token in APPROX_TOKEN_RE.findall(text))
+
+
+def truncate_to_tokens(text, max_tokens):
+    if max_tokens <= 0:
+        return ''
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+    # Cut on line boundaries while they fit, then on words
+    kept, used = [], 0
+    for line in text.split('\n'):
+        cost = count_tokens(line) + 1
+        if used + cost <= max_tokens:
+            kept.append(line)
+            used += cost
+            continue
+        words = []
+        for word in line.split():
+            cost = count_tokens(word)
+            if used + cost > max_tokens:
+                break
+            words.append(word)
+            used += cost
+        if words:
+            kept.append(' '.join(words))
+        break
+    return '\n'.join(kept)
+
+
+# Collapses whitespace and drops empty or exactly repeated lines (page headers/footers)
+def compact_text(text):
+    lines, seen = [], set()
+    for line in (text or '').splitlines():
+        line = SPACES_RE.sub(' ', line).strip()
+        if not line:
+            continue
+        key = line.lower()
+        if key in seen and len(line) < 80:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def _section_for(line):
+    match = HEADING_RE.match(line)
+    if not match:
+        return None
+    return HEADING_TO_SECTION.get(match.group(1).strip().lower())
+
+
+# Splits compacted resume text into [(section, text)] in document order
+def split_sections(text):
+    sections = []
+    name, lines = 'other', []
+    for line in text.split('\n'):
+        section = _section_for(line)
+        if section is not None:
+            if lines:
+                sections.append((name, '\n'.join(lines)))
+            name, lines = section, [line]
+        else:
+            lines.append(line)
+    if lines:
+        sections.append((name, '\n'.join(lines)))
+    return sections
+
+
+# Fits resume text into `budget` tokens, keeping the highest-priority sections whole
+def fit_resume(text, budget):
+    text = compact_text(text)
+    if count_tokens(text) <= budget:
+        return text
+    sections = sorted(split_sections(text), key=lambda section: SECTION_PRIORITY[section[0]])
+    kept, used = [], 0
+    for _, body in sections:
+        cost = count_tokens(body) + 1
+        if used + cost <= budget:
+            kept.append(body)
+            used += cost
+        else:
+            partial = truncate_to_tokens(body, budget - used - 1)
+            if partial:
+                kept.append(partial)
+            break
+    return '\n'.join(kept)
+
+
+# Fills `template` (with {job_description} and {resume} fields) so the whole
+# prompt stays within `budget` tokens, and logs how many tokens were saved.
+def build_prompt(template, job_description, resume_text, budget, label='prompt'):
+    template = textwrap.dedent(template).strip()
+    overhead = count_tokens(template.format(job_description='', resume=''))
+    available = max(budget - overhead, 0)
+
+    raw_job_description = job_description
+    job_description = compact_text(job_description)
+    jd_budget = int(available * JOB_DESCRIPTION_SHARE)
+    if count_tokens(job_description) > jd_budget:
+        job_description = truncate_to_tokens(job_description, jd_budget)
+    resume = fit_resume(resume_text, available - count_tokens(job_description))
+
+    prompt = template.format(job_description=job_description, resume=resume)
+    if logger.isEnabledFor(logging.INFO):
+        raw_tokens = overhead + count_tokens(raw_job_description) + count_tokens(resume_text or '')
+        prompt_tokens = count_tokens(prompt)
+        logger.info("%s: %d tokens (saved %d of %d)", label, prompt_tokens,
+                    max(raw_tokens - prompt_tokens, 0), raw_tokens)
+    return prompt
@@ -0,0 +1,68 @@
+import html
+import json
+import os
+import time
+from werkzeug.utils import secure_filename
+
+# Append-only store for answer-check results, one JSONL file per candidate.
+#
+# A submission appends a single line to its own candidate's file with one
+# O_APPEND write, so concurrent submitters never touch each other's data and
+# nothing is rewritten. The report is produced by render(), a generator that
+# reads one file at a time and yields HTML as it goes, suitable for
+# Flask's stream_with_context.
+
+
+class ResultsStore:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, candidate_id):
+        name = secure_filename(candidate_id)
+        if not name:
+            raise ValueError(f"Invalid candidate id: {candidate_id!r}")
+        return os.path.join(self.root, f"{name}.jsonl")
+
+    # Appends one submission; `results` is a list of dicts with answer,
+    # plagiarized and ai_generated (e.g. AnswerVerdict.to_dict())
+    def append(self, candidate_id, results):
+        record = {'submitted_at': time.time(), 'results': results}
+        line = (json.dumps(record) + '\n').encode('utf-8')
+        fd = os.open(self._path(candidate_id), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    # Candidate ids, oldest file first
+    def candidates(self):
+        entries = [entry for entry in os.scandir(self.root) if entry.name.endswith('.jsonl')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        return [entry.name[:-len('.jsonl')] for entry in entries]
+
+    def records(self, candidate_id):
+        try:
+            with open(self._path(candidate_id), encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    # Yields the HTML report chunk by chunk: every candidate, or just `candidate_ids`
+    def render(self, candidate_ids=None, label=str):
+        yield "<html><body><h2>Answer Analysis Results</h2>"
+        for candidate_id in (self.candidates() if candidate_ids is None else candidate_ids):
+            yield f"<h2>Candidate {html.escape(candidate_id)}</h2>"
+            for record in self.records(candidate_id):
+                submitted = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record['submitted_at']))
+                parts = [f"<p><em>Submitted {submitted}</em></p>"]
+                for idx, result in enumerate(record['results']):
+                    parts.append(f"<h3>Answer {idx+1}:</h3>")
+                    parts.append(f"<p>Text: {html.escape(result.get('answer') or '')}</p>")
+                    parts.append(f"<p>Plagiarized: {html.escape(label(result.get('plagiarized')))}</p>")
+                    parts.append(f"<p>AI Generated: {html.escape(label(result.get('ai_generated')))}</p>")
+                    parts.append("<br>")
+                yield ''.join(parts)
+        yield "</body></html>"
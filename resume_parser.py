@@ -0,0 +1,65 @@
+import logging
+import os
+import time
+import docx2txt
+import PyPDF2
+import textract
+
+# Resume parsing lives in its own module so extraction worker processes only
+# need this one. They still re-run the launching script as __mp_main__, which
+# imports the Flask app's modules but skips its init_services().
+
+logger = logging.getLogger(__name__)
+
+# Page and character budget for PDF extraction; 0 disables the limit. Matching
+# only needs the first few pages, so long CVs with embedded portfolios stop early.
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "30000"))
+
+# Anything that changes the extracted text for the same file bytes; mixed into cache keys
+PARSER_SETTINGS = f"pdf_max_pages={PDF_MAX_PAGES};pdf_max_chars={PDF_MAX_CHARS}"
+
+# Yields (page_number, text, seconds) one page at a time, stopping as soon as
+# the page or character budget is reached so later pages are never parsed.
+def iter_pdf_pages(file_path, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    with open(file_path, 'rb') as pdf_file:
+        reader = PyPDF2.PdfFileReader(pdf_file, strict=False)
+        num_pages = reader.numPages
+        if max_pages:
+            num_pages = min(num_pages, max_pages)
+        chars = 0
+        for page_number in range(num_pages):
+            start = time.perf_counter()
+            page_text = reader.getPage(page_number).extract_text() or ''
+            elapsed = time.perf_counter() - start
+            if max_chars and chars + len(page_text) > max_chars:
+                page_text = page_text[:max_chars - chars]
+            chars += len(page_text)
+            yield page_number, page_text, elapsed
+            if max_chars and chars >= max_chars:
+                break
+
+# Function to extract text from a PDF within the page/character budget.
+# Pass a list as `timings` to collect (page_number, seconds, chars) per page.
+def extract_pdf_text(file_path, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, timings=None):
+    chunks = []
+    for page_number, page_text, elapsed in iter_pdf_pages(file_path, max_pages, max_chars):
+        chunks.append(page_text)
+        if timings is not None:
+            timings.append((page_number, elapsed, len(page_text)))
+        logger.debug("%s page %d: %d chars in %.1f ms", file_path, page_number + 1, len(page_text), elapsed * 1000)
+    return '\n'.join(chunks)
+
+# Function to extract text from different resume formats; `timings` collects
+# per-page timings for PDFs, as in extract_pdf_text()
+def extract_text(file_path, timings=None):
+    try:
+        if file_path.endswith('.docx'):
+            return docx2txt.process(file_path)
+        elif file_path.endswith('.pdf'):
+            return extract_pdf_text(file_path, timings=timings)
+        else:
+            return textract.process(file_path).decode('utf-8')
+    except Exception as e:
+        print(f"Error processing file {file_path}: {e}")
+        return ""
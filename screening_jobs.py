@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Background screening jobs.
+#
+# The upload request only saves the files and enqueues a job; a small local
+# worker pool runs the screening and records per-resume status as it goes, so
+# the web worker returns immediately and several batches can be screened at
+# once. Clients poll the job for progress and results.
+#
+# Job and per-resume status are written through to a JobStore (SQLite, in a
+# file of its own) as they change, so a poll that lands on another worker
+# process than the one running the job still finds it.
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class ScreeningJob:
+    def __init__(self, filenames, job_id=None, store=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.status = QUEUED
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.resumes = [{'filename': filename, 'status': QUEUED} for filename in filenames]
+        self.store = store
+        self._lock = threading.Lock()
+
+    # Merges `fields` into the status record of the resume at `index`
+    def update(self, index, **fields):
+        with self._lock:
+            self.resumes[index].update(fields)
+            if self.store:
+                self.store.save_resume(self.id, index, self.resumes[index])
+
+    def start(self):
+        with self._lock:
+            self.status = RUNNING
+            self.started_at = time.time()
+            if self.store:
+                self.store.save_job(self)
+
+    def finish(self, error=None):
+        with self._lock:
+            self.status = FAILED if error else DONE
+            self.error = error
+            self.finished_at = time.time()
+            if self.store:
+                self.store.save_job(self)
+
+    def to_dict(self):
+        with self._lock:
+            resumes = [dict(resume) for resume in self.resumes]
+        finished = sum(1 for resume in resumes if resume['status'] in (DONE, FAILED))
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'total': len(resumes),
+            'completed': finished,
+            'resumes': resumes,
+        }
+
+
+class JobStore:
+    def __init__(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS screening_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS screening_job_resumes (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS screening_jobs_created_at ON screening_jobs (created_at);
+        """)
+        self._conn.commit()
+
+    def create(self, job):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO screening_jobs VALUES (?, ?, ?, ?, ?, ?)",
+                               (job.id, job.status, job.error, job.created_at, job.started_at, job.finished_at))
+            self._conn.executemany("INSERT INTO screening_job_resumes VALUES (?, ?, ?)",
+                                   [(job.id, i, json.dumps(resume)) for i, resume in enumerate(job.resumes)])
+
+    def save_job(self, job):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE screening_jobs SET status = ?, error = ?, started_at = ?, finished_at = ? "
+                               "WHERE id = ?", (job.status, job.error, job.started_at, job.finished_at, job.id))
+
+    def save_resume(self, job_id, index, resume):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE screening_job_resumes SET data = ? WHERE job_id = ? AND idx = ?",
+                               (json.dumps(resume), job_id, index))
+
+    # A read-only snapshot of a job, or None
+    def load(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT status, error, created_at, started_at, finished_at "
+                                     "FROM screening_jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            resumes = self._conn.execute("SELECT data FROM screening_job_resumes WHERE job_id = ? ORDER BY idx",
+                                         (job_id,)).fetchall()
+        job = ScreeningJob([], job_id)
+        job.status, job.error, job.created_at, job.started_at, job.finished_at = row
+        job.resumes = [json.loads(data) for data, in resumes]
+        return job
+
+    # Deletes the oldest finished jobs beyond the newest `max_jobs`
+    def prune(self, max_jobs):
+        with self._lock, self._conn:
+            old = [job_id for job_id, in self._conn.execute(
+                "SELECT id FROM screening_jobs WHERE finished_at IS NOT NULL AND id NOT IN "
+                "(SELECT id FROM screening_jobs ORDER BY created_at DESC LIMIT ?)", (max_jobs,))]
+            self._conn.executemany("DELETE FROM screening_jobs WHERE id = ?", [(job_id,) for job_id in old])
+            self._conn.executemany("DELETE FROM screening_job_resumes WHERE job_id = ?", [(job_id,) for job_id in old])
+
+
+class JobManager:
+    def __init__(self, workers=2, max_jobs=1000, store=None):
+        self.max_jobs = max_jobs
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='screening')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Queues run(job, *args) and returns the job right away
+    def submit(self, run, filenames, *args, job_id=None):
+        job = ScreeningJob(filenames, job_id, self.store)
+        if self.store:
+            self.store.create(job)
+            self.store.prune(self.max_jobs)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self.executor.submit(self._run, job, run, args)
+        return job
+
+    def _run(self, job, run, args):
+        job.start()
+        try:
+            run(job, *args)
+            job.finish()
+        except Exception as e:
+            logger.exception("Screening job %s failed", job.id)
+            job.finish(str(e))
+
+    # Forget the oldest finished jobs once there are more than max_jobs
+    def _prune(self):
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id].status in (DONE, FAILED):
+                del self._jobs[job_id]
+
+    # The live job if this process runs it, otherwise the stored snapshot
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.store:
+            job = self.store.load(job_id)
+        return job
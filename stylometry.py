@@ -0,0 +1,140 @@
+import re
+import numpy as np
+
+# Local stylometric prefilter for AI-generated answers.
+#
+# A batch of answers is tokenised once and every feature is computed for the
+# whole batch with flat NumPy arrays (a document id per token or character,
+# reduced with np.bincount), so scoring is effectively instant next to a
+# completion call. The features are combined by a small logistic model into a
+# confidence that an answer is AI-generated; only answers in the ambiguous
+# middle band need to go to the LLM.
+#
+# Features, per answer:
+#   sentence_cv            spread of sentence lengths (std / mean); model text is evenly paced
+#   type_token_ratio       distinct words / words over the first TTR_WINDOW words
+#   comma_rate             commas per word
+#   formal_punct_rate      semicolons, colons and dashes per word
+#   informal_rate          !, ?, ellipses, contractions and lowercase " i " per word
+#   repeated_trigram_rate  share of word trigrams that occur more than once
+#
+# The weights below are hand-set starting points, not a trained model; tune
+# them (or the ambiguity band used by callers) against labelled answers.
+
+FEATURE_NAMES = ('sentence_cv', 'type_token_ratio', 'comma_rate', 'formal_punct_rate',
+                 'informal_rate', 'repeated_trigram_rate')
+
+# (center, scale, weight) per feature; a positive weight means "more like AI"
+MODEL = {
+    'sentence_cv': (0.45, 0.15, -1.2),
+    'type_token_ratio': (0.62, 0.08, 0.5),
+    'comma_rate': (0.05, 0.025, 0.6),
+    'formal_punct_rate': (0.01, 0.01, 0.6),
+    'informal_rate': (0.01, 0.01, -0.9),
+    'repeated_trigram_rate': (0.03, 0.03, -0.3),
+}
+BIAS = 0.0
+
+# Answers shorter than this (in words) carry too little signal and score 0.5
+MIN_WORDS = 40
+TTR_WINDOW = 100
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z]+)?|\.\.\.|[.!?]+")
+# Spaced hyphens (" - ") are counted as dashes too
+FORMAL_CHARS = ';:–—'
+INFORMAL_CHARS = '!?…'
+
+_CENTER = np.array([MODEL[name][0] for name in FEATURE_NAMES])
+_SCALE = np.array([MODEL[name][1] for name in FEATURE_NAMES])
+_WEIGHT = np.array([MODEL[name][2] for name in FEATURE_NAMES])
+
+
+# Returns flat per-token arrays: answer id, vocabulary id, sentence terminator, informal token
+def _tokenize(texts):
+    tokens = [TOKEN_RE.findall(text or '') for text in texts]
+    doc_ids = np.repeat(np.arange(len(texts)), [len(doc) for doc in tokens])
+    flat = [token.lower() for doc in tokens for token in doc]
+    vocab = {token: i for i, token in enumerate(dict.fromkeys(flat))}
+    word_ids = np.fromiter(map(vocab.__getitem__, flat), dtype=np.int64, count=len(flat))
+    # Per-vocabulary flags, looked up for every token at once
+    is_end = np.array([not token[0].isalnum() for token in vocab], dtype=bool)
+    # Contractions and ellipses; ! and ? are counted per character
+    informal = np.array(["'" in token or token == '...' for token in vocab], dtype=bool)
+    return doc_ids, word_ids, is_end[word_ids], informal[word_ids]
+
+
+def _char_counts(texts, chars):
+    # One code point per element with a document id each, so every
+    # character class is a single masked bincount over the whole batch
+    codes = [np.frombuffer((text or '').encode('utf-32-le'), dtype=np.uint32) for text in texts]
+    doc_ids = np.repeat(np.arange(len(texts)), [len(c) for c in codes])
+    codes = np.concatenate(codes) if codes else np.zeros(0, dtype=np.uint32)
+    mask = np.isin(codes, [ord(c) for c in chars])
+    return np.bincount(doc_ids[mask], minlength=len(texts))
+
+
+def _lowercase_i(texts):
+    return np.array([len(re.findall(r"(?:^|\s)i(?=\s|')", text or '')) for text in texts])
+
+
+# Returns an (n_answers, len(FEATURE_NAMES)) array and the word count of each answer
+def features(texts):
+    n = len(texts)
+    doc_ids, word_ids, is_end, informal_tokens = _tokenize(texts)
+    is_word = ~is_end
+    word_docs, word_vals = doc_ids[is_word], word_ids[is_word]
+    words = np.bincount(word_docs, minlength=n).astype(np.float64)
+    safe_words = np.maximum(words, 1)
+
+    # Sentence lengths: tokens are in order, so a sentence is a run of words
+    # with the same answer and the same running count of terminators
+    sentence_ids = (np.cumsum(is_end) - is_end)[is_word]
+    breaks = np.flatnonzero((np.diff(word_docs) != 0) | (np.diff(sentence_ids) != 0)) + 1
+    starts = np.concatenate([[0], breaks]) if len(word_docs) else breaks
+    lengths = np.diff(np.append(starts, len(word_docs)))
+    sentence_docs = word_docs[starts]
+    count = np.bincount(sentence_docs, minlength=n)
+    mean = np.bincount(sentence_docs, weights=lengths, minlength=n) / np.maximum(count, 1)
+    mean_sq = np.bincount(sentence_docs, weights=lengths.astype(np.float64) ** 2, minlength=n) / np.maximum(count, 1)
+    std = np.sqrt(np.maximum(mean_sq - mean ** 2, 0))
+    # One sentence says nothing about pacing; leave it at the neutral center
+    sentence_cv = np.where(count > 1, std / np.maximum(mean, 1e-9), MODEL['sentence_cv'][0])
+
+    # Type-token ratio over each answer's first TTR_WINDOW words
+    vocab_size = int(word_ids.max()) + 1 if len(word_ids) else 1
+    position = np.arange(len(word_docs)) - np.searchsorted(word_docs, np.arange(n))[word_docs]
+    window = position < TTR_WINDOW
+    distinct = np.unique(word_docs[window] * vocab_size + word_vals[window]) // vocab_size
+    ttr = np.bincount(distinct, minlength=n) / np.maximum(np.minimum(words, TTR_WINDOW), 1)
+
+    # Share of each answer's word trigrams that occur more than once in it; the
+    # answer id and three word ids are mixed into one 64-bit key
+    same_doc = word_docs[:-2] == word_docs[2:]
+    trigram_docs = word_docs[:-2][same_doc]
+    keys = trigram_docs.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    for offset in range(3):
+        keys = (keys ^ word_vals[offset:len(word_vals) - 2 + offset][same_doc].astype(np.uint64)) \
+            * np.uint64(0x100000001B3)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    repeated = np.bincount(trigram_docs, weights=counts[inverse] > 1, minlength=n)
+    repeated_rate = repeated / np.maximum(np.bincount(trigram_docs, minlength=n), 1)
+
+    commas = _char_counts(texts, ',')
+    formal = _char_counts(texts, FORMAL_CHARS) + np.array([(text or '').count(' - ') for text in texts])
+    informal = (_char_counts(texts, INFORMAL_CHARS) + np.bincount(doc_ids[informal_tokens], minlength=n)
+                + _lowercase_i(texts))
+
+    matrix = np.stack([sentence_cv, ttr, commas / safe_words, formal / safe_words,
+                       informal / safe_words, repeated_rate], axis=1)
+    return matrix, words
+
+
+# Confidence in [0, 1] that each answer is AI-generated; short answers get 0.5
+def score(texts):
+    texts = list(texts)
+    if not texts:
+        return np.zeros(0)
+    matrix, words = features(texts)
+    z = BIAS + ((matrix - _CENTER) / _SCALE * _WEIGHT).sum(axis=1)
+    confidence = 1 / (1 + np.exp(-z))
+    return np.where(words >= MIN_WORDS, confidence, 0.5)
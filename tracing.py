@@ -0,0 +1,200 @@
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+
+# Lightweight span tracing for request handlers and background jobs.
+#
+# Tracer.trace() opens a root trace (one per request or job) and decides
+# whether it is sampled; span() marks the stages inside it. The
+# current trace and span live in context variables, so nested spans find
+# their parent without passing anything around, and spans in unsampled
+# traces (or outside any trace) cost one context-variable lookup. When a
+# sampled trace finishes, its timing tree is written to TRACE_DIR as Chrome
+# trace JSON (open in chrome://tracing or Perfetto) and/or appended to
+# spans.jsonl. Threads started with a copy of the caller's context (see
+# pipeline.Pipeline) add their spans to the same trace.
+
+logger = logging.getLogger(__name__)
+
+TRACE_ID_RE = re.compile(r"^[0-9a-fA-F-]{8,64}$")
+
+_current_trace = contextvars.ContextVar('trace', default=None)
+_current_span = contextvars.ContextVar('span', default=None)
+_NOOP = nullcontext()
+
+
+class Span:
+    def __init__(self, name, parent_id, attrs):
+        self.id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.parent_id = parent_id
+        self.attrs = attrs
+        self.thread_id = threading.get_ident()
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration = None
+        self.error = None
+
+    def finish(self, error=None):
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self, trace_id):
+        record = {'trace_id': trace_id, 'span_id': self.id, 'parent_id': self.parent_id, 'name': self.name,
+                  'start': self.start, 'duration_ms': round((self.duration or 0) * 1000, 3),
+                  'thread_id': self.thread_id}
+        if self.attrs:
+            record['attrs'] = self.attrs
+        if self.error:
+            record['error'] = self.error
+        return record
+
+
+class Trace:
+    def __init__(self, trace_id, sampled):
+        self.id = trace_id
+        self.sampled = sampled
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    # Chrome trace event format: one complete ("X") event per span, in microseconds
+    def to_chrome(self):
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = []
+        for span in spans:
+            args = dict(span.attrs, span_id=span.id, parent_id=span.parent_id)
+            if span.error:
+                args['error'] = span.error
+            events.append({'name': span.name, 'ph': 'X', 'ts': int(span.start * 1e6),
+                           'dur': int((span.duration or 0) * 1e6), 'pid': pid, 'tid': span.thread_id,
+                           'args': args})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'trace_id': self.id}}
+
+    def to_jsonl(self):
+        with self._lock:
+            spans = list(self.spans)
+        return ''.join(json.dumps(span.to_dict(self.id), default=str) + '\n' for span in spans)
+
+
+# Marks a stage of the current trace; a no-op outside a sampled trace
+def span(name, **attrs):
+    trace = _current_trace.get()
+    if trace is None or not trace.sampled:
+        return _NOOP
+    return _span(trace, name, attrs)
+
+
+@contextmanager
+def _span(trace, name, attrs):
+    parent = _current_span.get()
+    current = Span(name, parent.id if parent else None, attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.finish(e)
+        raise
+    else:
+        current.finish()
+    finally:
+        _current_span.reset(token)
+        trace.add(current)
+
+
+class Tracer:
+    # `sample_rate` is the share of traces recorded (0 disables recording, but
+    # trace ids are still issued); `formats` is a subset of ('chrome', 'jsonl')
+    def __init__(self, trace_dir='traces', sample_rate=0.0, formats=('jsonl',)):
+        self.trace_dir = trace_dir
+        self.sample_rate = sample_rate
+        self.formats = tuple(formats)
+        if sample_rate > 0:
+            os.makedirs(trace_dir, exist_ok=True)
+
+    # Opens a root trace and its root span; exports it on exit if sampled
+    @contextmanager
+    def trace(self, name, trace_id=None, sampled=None, **attrs):
+        if sampled is None:
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        current = Trace(trace_id or uuid.uuid4().hex, sampled)
+        trace_token = _current_trace.set(current)
+        span_token = _current_span.set(None)
+        try:
+            with span(name, **attrs):
+                yield current
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            if current.sampled:
+                self.export(current)
+
+    def export(self, trace):
+        try:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            if 'chrome' in self.formats:
+                with open(os.path.join(self.trace_dir, f"{trace.id}.json"), 'w') as f:
+                    json.dump(trace.to_chrome(), f, default=str)
+            if 'jsonl' in self.formats:
+                # One O_APPEND write per trace keeps concurrent writers' lines whole
+                data = trace.to_jsonl().encode('utf-8')
+                fd = os.open(os.path.join(self.trace_dir, 'spans.jsonl'), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+        except OSError as e:
+            logger.warning("Error exporting trace %s: %s", trace.id, e)
+
+    # Traces every request of a Flask app: the root span is named after the
+    # endpoint, an incoming X-Trace-Id is reused, and the id is returned in
+    # the X-Trace-Id response header whether or not the request was sampled
+    def init_app(self, app):
+        from flask import g, request
+
+        @app.before_request
+        def start_trace():
+            incoming = request.headers.get('X-Trace-Id', '')
+            trace_id = incoming if TRACE_ID_RE.match(incoming) else None
+            g._trace = self.trace(request.endpoint or request.path, trace_id=trace_id,
+                                  method=request.method, path=request.path)
+            g._trace_id = g._trace.__enter__().id
+
+        @app.after_request
+        def add_trace_header(response):
+            trace_id = g.get('_trace_id')
+            if trace_id:
+                response.headers['X-Trace-Id'] = trace_id
+            return response
+
+        @app.teardown_request
+        def finish_trace(exc):
+            trace = g.pop('_trace', None)
+            if trace is not None:
+                if exc is None:
+                    trace.__exit__(None, None, None)
+                else:
+                    trace.__exit__(type(exc), exc, exc.__traceback__)
+
+
+# Tracer configured from TRACE_* environment variables
+def tracer_from_env():
+    formats = [name.strip() for name in os.getenv("TRACE_FORMATS", "jsonl").split(',') if name.strip()]
+    return Tracer(
+        trace_dir=os.getenv("TRACE_DIR", "traces"),
+        sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "0")),
+        formats=formats,
+    )
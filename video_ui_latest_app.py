@@ -5,8 +5,13 @@ import moviepy.editor as mp
 import speech_recognition as sr
 from pydub import AudioSegment
 import requests
+from tracing import span, tracer_from_env
 
 app = Flask(__name__)
+
+# Requests are traced stage by stage when sampled; see tracing.tracer_from_env for settings
+tracer = tracer_from_env()
+tracer.init_app(app)
 app.config['UPLOAD_FOLDER'] = 'uploads/'
 
 if not os.path.exists(app.config['UPLOAD_FOLDER']):
@@ -47,24 +52,28 @@ def analyze():
     if file:
         filename = secure_filename(file.filename)
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        with span('save'):
+            file.save(file_path)
 
         # Extract audio from video
-        video = mp.VideoFileClip(file_path)
-        audio_path = file_path.replace('.mp4', '.wav')
-        video.audio.write_audiofile(audio_path)
+        with span('extract_audio'):
+            video = mp.VideoFileClip(file_path)
+            audio_path = file_path.replace('.mp4', '.wav')
+            video.audio.write_audiofile(audio_path)
 
-        # Convert to WAV if not already
-        if not audio_path.endswith('.wav'):
-            audio = AudioSegment.from_file(audio_path)
-            audio_path = audio_path.replace('.mp4', '.wav')
-            audio.export(audio_path, format="wav")
+            # Convert to WAV if not already
+            if not audio_path.endswith('.wav'):
+                audio = AudioSegment.from_file(audio_path)
+                audio_path = audio_path.replace('.mp4', '.wav')
+                audio.export(audio_path, format="wav")
 
         # Transcribe audio
-        transcript = transcribe_audio(audio_path)
+        with span('transcribe'):
+            transcript = transcribe_audio(audio_path)
 
         # Perform sentiment analysis using Azure OpenAI
-        sentiment_analysis = analyze_sentiment(transcript)
+        with span('analyze_sentiment'):
+            sentiment_analysis = analyze_sentiment(transcript)
 
         return render_template('index.html', result=sentiment_analysis)
 
@@ -1,17 +1,64 @@
 import cv2
 import os
+from media_pipeline import DEFAULT_SAMPLING
 
-def extract_frames(video_path, frame_rate=1):
+# Gaps longer than this are skipped by seeking; shorter ones with grab(),
+# which demuxes and decodes but skips the colour conversion and copy
+SEEK_MIN_SECONDS = 2.0
+
+# Streams (timestamp, frame) pairs sampled and scaled by `sampling` (a
+# media_pipeline.FrameSampling, the same policy MediaDecode applies), or taken
+# at the given `timestamps` (seconds) instead of every 1/fps seconds. Only one
+# frame is held at a time.
+def iter_frames(video_path, sampling=DEFAULT_SAMPLING, timestamps=None):
     vidcap = cv2.VideoCapture(video_path)
-    frames = []
-    success, image = vidcap.read()
-    count = 0
-    while success:
-        if count % frame_rate == 0:
-            frames.append(image)
-        success, image = vidcap.read()
-        count += 1
-    return frames
+    try:
+        source_fps = vidcap.get(cv2.CAP_PROP_FPS) or 30.0
+        position = 0
+        for timestamp in _targets(sampling.fps, timestamps):
+            target = int(round(timestamp * source_fps))
+            if target < position:
+                continue
+            if target - position > SEEK_MIN_SECONDS * source_fps:
+                if not vidcap.set(cv2.CAP_PROP_POS_FRAMES, target):
+                    return
+                position = target
+            while position < target:
+                if not vidcap.grab():
+                    return
+                position += 1
+            success, image = vidcap.read()
+            if not success:
+                return
+            position += 1
+            yield timestamp, _downscale(image, sampling.max_width)
+    finally:
+        vidcap.release()
+
+def _targets(fps, timestamps):
+    if timestamps is not None:
+        yield from sorted(timestamps)
+        return
+    index = 0
+    while True:
+        yield index / fps
+        index += 1
+
+# Same size as FrameSampling's ffmpeg scale='min(max_width,iw)':-2, i.e. an
+# even height rounded to the nearest, so both decoders produce equal frames
+def _downscale(image, max_width):
+    height, width = image.shape[:2]
+    if not max_width:
+        return image
+    new_width = min(max_width, width)
+    new_height = (new_width * height + width) // (2 * width) * 2
+    if (new_width, new_height) == (width, height):
+        return image
+    return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+
+def extract_frames(video_path, sampling=DEFAULT_SAMPLING, timestamps=None):
+    for _, image in iter_frames(video_path, sampling, timestamps):
+        yield image
 
 # Emotion labels
 emotions_dict = {0: 'angry', 1: 'disgust', 2: 'fear', 3: 'happy', 4: 'sad', 5: 'surprise', 6: 'neutral'}
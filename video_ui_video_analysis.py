@@ -1,37 +1,82 @@
+import os
 import cv2
 import numpy as np
-from moviepy.editor import VideoFileClip
 from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.image import img_to_array
-from utils import extract_frames, emotions_dict
+from face_detectors import get_detector
+from face_tracking import FaceTracker
+from media_pipeline import FrameSampling, MediaDecode
+from utils import emotions_dict
 
 # Load pre-trained emotion detection model
 model = load_model('emotion_model.h5')
 
-def analyze_video(video_path):
-    # Extract frames from the video
-    frames = extract_frames(video_path)
+# Frames analysed per second of video, and the width they are scaled down to
+FRAME_SAMPLE_FPS = float(os.getenv("FRAME_SAMPLE_FPS", "1"))
+FRAME_MAX_WIDTH = int(os.getenv("FRAME_MAX_WIDTH", "640")) or None
+frame_sampling = FrameSampling(fps=FRAME_SAMPLE_FPS, max_width=FRAME_MAX_WIDTH)
 
-    emotions_count = {emotion: 0 for emotion in emotions_dict.values()}
+# Face detection backend: haar, mtcnn or dnn (see face_detectors.py)
+FACE_DETECTOR = os.getenv("FACE_DETECTOR", "haar")
+
+# Detect-then-track: run the detector on every Nth sampled frame and track
+# faces in between (see face_tracking.py); 1 detects on every frame
+FACE_DETECT_EVERY = int(os.getenv("FACE_DETECT_EVERY", "1"))
+FACE_TRACK_MIN_CONFIDENCE = float(os.getenv("FACE_TRACK_MIN_CONFIDENCE", "0.6"))
+
+def face_detector():
+    detector = get_detector(FACE_DETECTOR)
+    if FACE_DETECT_EVERY > 1:
+        return FaceTracker(detector, FACE_DETECT_EVERY, FACE_TRACK_MIN_CONFIDENCE)
+    return detector
+
+# Faces per model call; ROIs from consecutive frames are batched together
+EMOTION_BATCH_SIZE = int(os.getenv("EMOTION_BATCH_SIZE", "64"))
+EMOTION_INPUT_SIZE = (48, 48)
 
-    for frame in frames:
+# Yields (timestamp, (x, y, w, h), emotion, probability) for every face in
+# `frames`, an iterable of (timestamp, BGR image), in frame order. Face crops
+# are resized into a preallocated uint8 batch, normalized in one step and sent
+# to the model `batch_size` at a time; predictions are then matched back to
+# the frame and box they came from.
+def predict_emotions(frames, batch_size=EMOTION_BATCH_SIZE):
+    detector = face_detector()
+    crops = np.empty((batch_size,) + EMOTION_INPUT_SIZE, dtype=np.uint8)
+    inputs = np.empty((batch_size,) + EMOTION_INPUT_SIZE + (1,), dtype=np.float32)
+    owners = []
+
+    def flush():
+        count = len(owners)
+        np.multiply(crops[:count], 1 / 255.0, out=inputs[:count, :, :, 0])
+        preds = np.asarray(model.predict_on_batch(inputs[:count]))
+        best = preds.argmax(axis=1)
+        results = [(timestamp, box, emotions_dict[int(label)], float(preds[i, label]))
+                   for i, ((timestamp, box), label) in enumerate(zip(owners, best))]
+        owners.clear()
+        return results
+
+    for timestamp, frame in frames:
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml').detectMultiScale(gray, scaleFactor=1.3, minNeighbors=5)
+        for (x, y, w, h) in detector.detect(frame, gray):
+            cv2.resize(gray[y:y+h, x:x+w], EMOTION_INPUT_SIZE, dst=crops[len(owners)])
+            owners.append((timestamp, (x, y, w, h)))
+            if len(owners) == batch_size:
+                yield from flush()
+    if owners:
+        yield from flush()
 
-        for (x, y, w, h) in faces:
-            roi = gray[y:y+h, x:x+w]
-            roi = cv2.resize(roi, (48, 48))
-            roi = roi.astype("float") / 255.0
-            roi = img_to_array(roi)
-            roi = np.expand_dims(roi, axis=0)
+# Counts the dominant emotion of every face in `frames`, (timestamp, BGR image) pairs
+def analyze_frames(frames):
+    emotions_count = {emotion: 0 for emotion in emotions_dict.values()}
+    for _, _, emotion_label, _ in predict_emotions(frames):
+        emotions_count[emotion_label] += 1
+    return emotions_count
 
-            preds = model.predict(roi)[0]
-            emotion_probability = np.max(preds)
-            emotion_label = emotions_dict[np.argmax(preds)]
-            emotions_count[emotion_label] += 1
+def analyze_video(video_path):
+    # Decode only the sampled frames; the audio isn't needed here
+    with MediaDecode(video_path, frame_sampling, audio=False) as media:
+        emotions_count = analyze_frames(media.frames())
 
     # Determine the most common emotion
     most_common_emotion = max(emotions_count, key=emotions_count.get)
 
     return f"The most common emotion detected in the video is {most_common_emotion}."
-